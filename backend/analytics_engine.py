@@ -0,0 +1,208 @@
+"""
+Server-side analytics aggregations.
+
+Counts are computed by MongoDB with aggregation pipelines instead of loading
+documents into Python, so the cost depends on the size of the requested
+window rather than on the size of the collections.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta
+
+from database import aggregate_documents, count_documents, get_documents
+
+# Collections shown in the overview and the date field used for their growth
+OVERVIEW_COLLECTIONS = {
+    "users": "created_at",
+    "articles": "date",
+    "contacts": "created_at",
+    "quotes": "created_at",
+}
+
+# Fields listed by the admin dashboard
+RECENT_CONTACT_FIELDS = {"_id": 0, "id": 1, "nom": 1, "email": 1, "sujet": 1, "created_at": 1}
+RECENT_ARTICLE_FIELDS = {"_id": 0, "id": 1, "title": 1, "category": 1, "author": 1, "created_at": 1}
+
+# Client roles (anchored prefixes, so the role index bounds the scan)
+CLIENT_ROLES = {"$in": [re.compile("^client"), re.compile("^prospect")]}
+OPEN_TICKET_STATUSES = {"$nin": ["resolved", "closed"]}
+
+def growth_rate(current_period: int, previous_period: int) -> float:
+    """Percentage growth between two periods (100% when starting from zero)"""
+    if previous_period == 0:
+        return 100.0 if current_period > 0 else 0.0
+    return round(((current_period - previous_period) / previous_period) * 100, 1)
+
+def period_counts_pipeline(date_field: str, start_date: datetime, previous_start: datetime) -> list:
+    """Pipeline counting documents in the current and previous periods in one pass"""
+    return [
+        # Only the two periods are scanned (index on date_field)
+        {"$match": {date_field: {"$gte": previous_start}}},
+        {"$facet": {
+            "current": [
+                {"$match": {date_field: {"$gte": start_date}}},
+                {"$count": "count"}
+            ],
+            "previous": [
+                {"$match": {date_field: {"$lt": start_date}}},
+                {"$count": "count"}
+            ]
+        }}
+    ]
+
+async def get_period_counts(collection_name: str, date_field: str,
+                            start_date: datetime, previous_start: datetime):
+    """Return (current_period, previous_period) counts for a collection"""
+    results = await aggregate_documents(
+        collection_name, period_counts_pipeline(date_field, start_date, previous_start), length=1
+    )
+    facets = results[0] if results else {}
+
+    def _count(name):
+        bucket = facets.get(name) or [{}]
+        return bucket[0].get("count", 0)
+
+    return _count("current"), _count("previous")
+
+async def get_collection_growth(collection_name: str, date_field: str, days: int, now: datetime = None):
+    """Total, current/previous period counts and growth for one collection"""
+    end_date = now or datetime.utcnow()
+    start_date = end_date - timedelta(days=days)
+    previous_start = start_date - timedelta(days=days)
+
+    total, (current_period, previous_period) = await asyncio.gather(
+        count_documents(collection_name, estimated=True),
+        get_period_counts(collection_name, date_field, start_date, previous_start)
+    )
+
+    return {
+        "total": total,
+        "current": current_period,
+        "previous": previous_period,
+        "growth": growth_rate(current_period, previous_period)
+    }
+
+async def get_overview_metrics(days: int, now: datetime = None):
+    """Growth metrics for every overview collection, queried concurrently"""
+    names = list(OVERVIEW_COLLECTIONS)
+    results = await asyncio.gather(*[
+        get_collection_growth(name, OVERVIEW_COLLECTIONS[name], days, now) for name in names
+    ])
+    return dict(zip(names, results))
+
+def client_stats_pipeline(month_ago: datetime) -> list:
+    """Client counts, distributed points, pending quotes and open tickets in one pass
+
+    Runs on `users`; the other collections are appended with `$unionWith`,
+    each contributing a single pre-aggregated document tagged by `source`.
+    """
+    def union_count(collection_name: str, match: dict, source: str) -> dict:
+        return {"$unionWith": {"coll": collection_name, "pipeline": [
+            {"$match": match},
+            {"$count": "count"},
+            {"$set": {"source": source}}
+        ]}}
+
+    return [
+        {"$match": {"role": CLIENT_ROLES}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "new": [{"$match": {"created_at": {"$gte": month_ago}}}, {"$count": "count"}],
+            "active": [{"$match": {"is_active": True}}, {"$count": "count"}]
+        }},
+        {"$set": {"source": "clients"}},
+        {"$unionWith": {"coll": "point_transactions", "pipeline": [
+            {"$match": {"points": {"$gt": 0}}},
+            {"$group": {"_id": None, "count": {"$sum": "$points"}}},
+            {"$project": {"_id": 0, "count": 1, "source": "points"}}
+        ]}},
+        union_count("quote_requests", {"status": "pending"}, "pending_quotes"),
+        union_count("support_tickets", {"status": OPEN_TICKET_STATUSES}, "open_tickets"),
+    ]
+
+async def get_client_stats(now: datetime = None):
+    """Exact client statistics for the admin dashboard, in one round trip"""
+    month_ago = (now or datetime.utcnow()) - timedelta(days=30)
+    results = await aggregate_documents("users", client_stats_pipeline(month_ago))
+    by_source = {result.pop("source"): result for result in results}
+
+    clients = by_source.get("clients", {})
+
+    def _facet_count(name):
+        bucket = clients.get(name) or [{}]
+        return bucket[0].get("count", 0)
+
+    def _count(source):
+        return by_source.get(source, {}).get("count", 0)
+
+    return {
+        "total_clients": _facet_count("total"),
+        "new_clients_this_month": _facet_count("new"),
+        "active_clients": _facet_count("active"),
+        "total_points_distributed": _count("points"),
+        "pending_quotes": _count("pending_quotes"),
+        "open_tickets": _count("open_tickets"),
+    }
+
+async def get_admin_dashboard_stats():
+    """Admin dashboard totals and recent items, queried concurrently
+
+    Totals are count-only queries (collection metadata when unfiltered) and
+    recent items only load the listed fields.
+    """
+    (
+        articles_count, contacts_count, services_count, users_count,
+        (recent_contacts, _), (recent_articles, _)
+    ) = await asyncio.gather(
+        count_documents("articles", estimated=True),
+        count_documents("contacts", estimated=True),
+        count_documents("services", {"active": True}),
+        count_documents("users", estimated=True),
+        get_documents(
+            "contacts", {}, limit=5, sort_field="created_at", sort_direction=-1,
+            count="none", projection=RECENT_CONTACT_FIELDS
+        ),
+        get_documents(
+            "articles", {}, limit=5, sort_field="created_at", sort_direction=-1,
+            count="none", projection=RECENT_ARTICLE_FIELDS
+        )
+    )
+
+    return {
+        "totals": {
+            "articles": articles_count,
+            "contacts": contacts_count,
+            "services": services_count,
+            "users": users_count
+        },
+        "recent_contacts": recent_contacts,
+        "recent_articles": recent_articles
+    }
+
+async def get_client_dashboard_counts(user_id: str):
+    """Recent transactions and quote/ticket counters of one client, queried concurrently
+
+    Quote counters come from a single `$group` by status over the client's
+    quote requests (covered by the (user_id, status) index).
+    """
+    (transactions, _), quote_statuses, open_tickets = await asyncio.gather(
+        get_documents(
+            "point_transactions", {"user_id": user_id}, limit=10,
+            sort_field="created_at", sort_direction=-1, count="none", projection={"_id": 0}
+        ),
+        aggregate_documents("quote_requests", [
+            {"$match": {"user_id": user_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]),
+        count_documents("support_tickets", {"user_id": user_id, "status": OPEN_TICKET_STATUSES})
+    )
+
+    quotes_by_status = {entry["_id"]: entry["count"] for entry in quote_statuses}
+    return {
+        "recent_transactions": transactions,
+        "active_quotes": sum(
+            count for status, count in quotes_by_status.items() if status not in ("completed", "rejected")
+        ),
+        "completed_projects": quotes_by_status.get("completed", 0),
+        "open_tickets": open_tickets
+    }
@@ -1,12 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 import os
 from pydantic import BaseModel
-from database import get_document, create_document, get_documents, update_document
+from database import get_document, create_document, get_documents
+from passwords import pwd_context, password_hasher
+from cache import MemoryCache, MISSING, invalidate, on_invalidate
+from ledger import LOYALTY_TIERS, DEFAULT_TIER, apply_points
 
 # Security configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-change-this-in-production")
@@ -14,10 +16,12 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# Verified principals, so authenticated requests don't hit the users collection
+PRINCIPAL_NAMESPACE = "principal"
+principal_cache = MemoryCache(max_entries=1024)
+
 # Models
 class Token(BaseModel):
     access_token: str
@@ -65,7 +69,7 @@ class UserUpdate(BaseModel):
     available_points: Optional[int] = None
     loyalty_tier: Optional[str] = None
 
-# Utility functions
+# Utility functions (blocking, use password_hasher from async code)
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -91,7 +95,7 @@ def create_refresh_token(data: dict):
 
 async def get_user(username: str):
     """Get user from database by username"""
-    users, _ = await get_documents("users", {"username": username}, limit=1)
+    users, _ = await get_documents("users", {"username": username}, limit=1, count="none")
     if users:
         user_data = users[0]
         user_data.pop('_id', None)
@@ -106,12 +110,36 @@ async def get_user_by_id(user_id: str):
         return UserInDB(**user_data)
     return None
 
+def principal_ttl() -> int:
+    return int(os.environ.get("PRINCIPAL_CACHE_TTL", "30"))
+
+async def _evict_principals(namespaces: list):
+    for namespace in namespaces:
+        if namespace == PRINCIPAL_NAMESPACE:
+            principal_cache.clear()
+        elif namespace.startswith(f"{PRINCIPAL_NAMESPACE}:"):
+            principal_cache.delete(namespace.split(":", 1)[1])
+
+on_invalidate(_evict_principals, PRINCIPAL_NAMESPACE)
+
+async def invalidate_principal(user_id: str):
+    """Drop the cached principal of a modified user, in every worker
+
+    Only the user id travels on the bus: principals live in each worker's
+    memory, the shared backend is not scanned.
+    """
+    await invalidate(f"{PRINCIPAL_NAMESPACE}:{user_id}")
+
+async def invalidate_all_principals():
+    """Drop every cached principal (bulk user updates)"""
+    await invalidate(PRINCIPAL_NAMESPACE)
+
 async def authenticate_user(username: str, password: str):
     """Authenticate user credentials"""
     user = await get_user(username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await password_hasher.verify(password, user.hashed_password):
         return False
     return user
 
@@ -133,9 +161,12 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    user = await get_user_by_id(token_data.user_id)
-    if user is None:
-        raise credentials_exception
+    user = principal_cache.get(token_data.user_id)
+    if user is MISSING:
+        user = await get_user_by_id(token_data.user_id)
+        if user is None:
+            raise credentials_exception
+        principal_cache.set(token_data.user_id, user, principal_ttl())
     return user
 
 async def get_current_active_user(current_user: UserInDB = Depends(get_current_user)):
@@ -174,14 +205,10 @@ async def get_current_premium_client(current_user: UserInDB = Depends(get_curren
 
 def get_loyalty_tier(points: int) -> str:
     """Calculate loyalty tier based on points"""
-    if points >= 5000:
-        return "platinum"
-    elif points >= 2000:
-        return "gold"
-    elif points >= 500:
-        return "silver"
-    else:
-        return "bronze"
+    for threshold, tier in LOYALTY_TIERS:
+        if points >= threshold:
+            return tier
+    return DEFAULT_TIER
 
 def get_next_tier_points(current_tier: str, current_points: int) -> int:
     """Get points needed for next tier"""
@@ -209,7 +236,7 @@ async def create_user(user: UserCreate):
         )
     
     # Check if email already exists
-    users, _ = await get_documents("users", {"email": user.email}, limit=1)
+    users, _ = await get_documents("users", {"email": user.email}, limit=1, count="none")
     if users:
         raise HTTPException(
             status_code=400,
@@ -223,7 +250,7 @@ async def create_user(user: UserCreate):
         "username": user.username,
         "email": user.email,
         "full_name": user.full_name,
-        "hashed_password": get_password_hash(user.password),
+        "hashed_password": await password_hasher.hash(user.password),
         "role": user.role,
         "is_active": True,
         "created_at": datetime.utcnow(),
@@ -248,50 +275,22 @@ async def create_user(user: UserCreate):
     return User(**user_data)
 
 async def update_user_points(user_id: str, points_to_add: int, description: str, created_by: str = None):
-    """Update user loyalty points and create transaction record"""
-    from models import PointTransaction
-    
-    # Get current user
-    user = await get_user_by_id(user_id)
+    """Update user loyalty points and create transaction record (atomic, see ledger.py)"""
+    user = await apply_points(user_id, points_to_add, description, created_by)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Calculate new points
-    new_total = user.total_points + points_to_add
-    new_available = max(0, user.available_points + points_to_add)
-    
-    # Calculate new loyalty tier
-    new_tier = get_loyalty_tier(new_total)
-    
-    # Update user
-    update_data = {
-        "total_points": new_total,
-        "available_points": new_available,
-        "loyalty_tier": new_tier
-    }
-    
-    await update_document("users", user_id, update_data)
-    
-    # Create transaction record
-    transaction = PointTransaction(
-        user_id=user_id,
-        points=points_to_add,
-        transaction_type="earned" if points_to_add > 0 else "spent",
-        description=description,
-        created_by=created_by
-    )
-    
-    await create_document("point_transactions", transaction.dict())
+    await invalidate_principal(user_id)
     
-    return new_total, new_available, new_tier
+    return user["total_points"], user["available_points"], user["loyalty_tier"]
 
 async def init_admin_user():
     """Initialize default admin user if none exists"""
     try:
         # Check if any admin exists
-        users, count = await get_documents("users", {"role": "admin"}, limit=1)
+        users, _ = await get_documents("users", {"role": "admin"}, limit=1, count="none")
         
-        if count == 0:
+        if not users:
             # Create default admin
             admin_data = UserCreate(
                 username="admin",
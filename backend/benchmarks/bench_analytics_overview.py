@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'aperçu analytics (agrégation serveur)
+
+Remplit une base dédiée avec des collections de taille croissante et mesure
+la latence de get_overview_metrics. La latence doit rester stable lorsque les
+collections dépassent 1M de documents, seule la fenêtre demandée étant lue.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_analytics_overview.py [10000 100000 1000000]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "anomalya_bench")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from database import connect_to_mongo, close_mongo_connection, get_collection, db
+from analytics_engine import OVERVIEW_COLLECTIONS, get_overview_metrics
+
+BATCH_SIZE = 10000
+RUNS = 20
+SPREAD_DAYS = 3 * 365
+
+async def grow_collection(name: str, date_field: str, target: int):
+    """Insert documents until the collection holds `target` documents"""
+    collection = await get_collection(name)
+    await collection.create_index(date_field)
+    current = await collection.estimated_document_count()
+    now = datetime.utcnow()
+
+    while current < target:
+        batch = min(BATCH_SIZE, target - current)
+        await collection.insert_many([
+            {date_field: now - timedelta(minutes=random.randint(0, SPREAD_DAYS * 24 * 60))}
+            for _ in range(batch)
+        ])
+        current += batch
+
+async def measure(days: int):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await get_overview_metrics(days)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+async def main(sizes):
+    await connect_to_mongo()
+    try:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        print(f"{'documents':>12} | {'range':>5} | {'p50 (ms)':>9} | {'p95 (ms)':>9}")
+        for size in sizes:
+            for name, date_field in OVERVIEW_COLLECTIONS.items():
+                await grow_collection(name, date_field, size)
+            for days in (7, 30, 90):
+                p50, p95 = await measure(days)
+                print(f"{size:>12} | {days:>4}d | {p50:>9.2f} | {p95:>9.2f}")
+    finally:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    asyncio.run(main(sorted(sizes)))
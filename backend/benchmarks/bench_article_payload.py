@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la liste d'articles : documents complets contre projection résumé
+
+Génère des articles avec un contenu de 50 KB (2000 par défaut) dans une base
+dédiée et compare, pour une page de /api/news, la latence de la requête et la
+taille du JSON produit avec les documents complets (Article) et avec la
+projection ArticleSummary.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_article_payload.py [2000]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "anomalya_bench")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from fastapi.encoders import jsonable_encoder
+
+from database import connect_to_mongo, close_mongo_connection, get_collection, get_documents_page, db
+from indexes import ensure_indexes
+from models import Article, ArticleSummary
+from routers.news import SUMMARY_PROJECTION
+
+BATCH_SIZE = 500
+CONTENT_SIZE = 50 * 1024
+PAGE_SIZES = [10, 50]
+RUNS = 20
+
+async def seed(size: int):
+    collection = await get_collection("articles")
+    now = datetime.utcnow()
+    body = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 1000)[:CONTENT_SIZE]
+    for start in range(0, size, BATCH_SIZE):
+        await collection.insert_many([{
+            "id": str(uuid.uuid4()),
+            "title": f"Article {start + i}",
+            "category": "Tech",
+            "excerpt": "Résumé de l'article " * 8,
+            "content": body,
+            "image": "https://example.com/image.jpg",
+            "author": "Anomalya",
+            "readTime": "5 min",
+            "tags": ["web", "sécurité", "cloud"],
+            "isPinned": False,
+            "date": now - timedelta(minutes=start + i),
+            "created_at": now - timedelta(minutes=start + i),
+            "updated_at": now - timedelta(minutes=start + i),
+        } for i in range(min(BATCH_SIZE, size - start))])
+
+async def measure(limit: int, model, projection: dict = None):
+    """Median latency (ms) of query + serialization, and payload size (bytes)"""
+    timings = []
+    payload = b""
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        documents, _, _ = await get_documents_page(
+            "articles", limit=limit, sort_field="date", projection=projection
+        )
+        for document in documents:
+            document.pop("_id", None)
+        payload = json.dumps(jsonable_encoder([model(**document) for document in documents])).encode()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(payload)
+
+async def main(size: int):
+    await connect_to_mongo()
+    try:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        print(f"🌱 Seeding {size} articles ({CONTENT_SIZE // 1024} KB content)...")
+        await seed(size)
+        await ensure_indexes()
+
+        print(f"{'page':>4} | {'full p50 (ms)':>13} | {'full (KB)':>9} | {'summary p50 (ms)':>16} | {'summary (KB)':>12}")
+        for limit in PAGE_SIZES:
+            full_ms, full_bytes = await measure(limit, Article)
+            summary_ms, summary_bytes = await measure(limit, ArticleSummary, SUMMARY_PROJECTION)
+            print(
+                f"{limit:>4} | {full_ms:>13.1f} | {full_bytes / 1024:>9.1f} | "
+                f"{summary_ms:>16.1f} | {summary_bytes / 1024:>12.1f}"
+            )
+    finally:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark du tableau de bord client sous charge
+
+Remplit une base dédiée (transactions de points, devis, tickets pour 1000
+clients) puis lance des tableaux de bord concurrents. Compare le p95 de
+analytics_engine.get_client_dashboard_counts à celui d'un aller-retour
+simple (find_one indexé) mesuré sous la même charge : les sous-requêtes
+étant émises ensemble, les deux doivent rester du même ordre.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_client_dashboard.py [50]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "anomalya_bench")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from database import connect_to_mongo, close_mongo_connection, get_collection, db
+from indexes import ensure_indexes
+from analytics_engine import get_client_dashboard_counts
+
+CLIENTS = 1000
+PER_CLIENT = 20
+REQUESTS_PER_WORKER = 40
+QUOTE_STATUSES = ["pending", "in_review", "approved", "completed", "rejected"]
+TICKET_STATUSES = ["open", "in_progress", "waiting_response", "resolved", "closed"]
+
+async def seed(user_ids: list):
+    now = datetime.utcnow()
+    for name, factory in {
+        "point_transactions": lambda user_id, i: {"points": random.randint(-50, 200), "description": "Bench"},
+        "quote_requests": lambda user_id, i: {"status": random.choice(QUOTE_STATUSES)},
+        "support_tickets": lambda user_id, i: {"status": random.choice(TICKET_STATUSES)},
+    }.items():
+        collection = await get_collection(name)
+        await collection.insert_many([{
+            **factory(user_id, i),
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "created_at": now - timedelta(minutes=i),
+        } for user_id in user_ids for i in range(PER_CLIENT)])
+
+async def timed_worker(call, user_ids: list) -> list:
+    timings = []
+    for _ in range(REQUESTS_PER_WORKER):
+        started = time.perf_counter()
+        await call(random.choice(user_ids))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+async def p95_under_load(call, user_ids: list, concurrency: int) -> float:
+    results = await asyncio.gather(*[timed_worker(call, user_ids) for _ in range(concurrency)])
+    timings = sorted(timing for worker in results for timing in worker)
+    return timings[int(len(timings) * 0.95) - 1]
+
+async def main(concurrency: int):
+    await connect_to_mongo()
+    try:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        user_ids = [str(uuid.uuid4()) for _ in range(CLIENTS)]
+        print(f"🌱 Seeding {CLIENTS} clients x {PER_CLIENT} documents per collection...")
+        await seed(user_ids)
+        await ensure_indexes()
+
+        tickets = await get_collection("support_tickets")
+
+        async def round_trip(user_id):
+            await tickets.find_one({"user_id": user_id}, {"_id": 0, "id": 1})
+
+        round_trip_p95 = await p95_under_load(round_trip, user_ids, concurrency)
+        dashboard_p95 = await p95_under_load(get_client_dashboard_counts, user_ids, concurrency)
+        print(f"concurrency={concurrency}")
+        print(f"single round trip p95 : {round_trip_p95:>7.1f} ms")
+        print(f"client dashboard p95  : {dashboard_p95:>7.1f} ms")
+    finally:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
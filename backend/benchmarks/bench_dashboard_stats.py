@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark des statistiques du tableau de bord admin : avant / après
+
+Remplit une base dédiée (articles, contacts, services, utilisateurs) et compare
+l'ancienne implémentation (six requêtes séquentielles, documents complets,
+comptages exacts) à analytics_engine.get_admin_dashboard_stats (requêtes
+concurrentes, comptages seuls, projections), hors cache de réponses.
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_dashboard_stats.py [100000]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "anomalya_bench")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from database import connect_to_mongo, close_mongo_connection, get_collection, get_documents, db
+from indexes import ensure_indexes
+from analytics_engine import get_admin_dashboard_stats
+
+BATCH_SIZE = 5000
+RUNS = 30
+
+async def seed(size: int):
+    now = datetime.utcnow()
+    documents = {
+        "articles": lambda i: {"title": f"Article {i}", "category": "Tech", "author": "Anomalya",
+                               "content": "Lorem ipsum " * 500},
+        "contacts": lambda i: {"nom": f"Contact {i}", "email": f"contact{i}@test.com",
+                               "sujet": "Devis", "message": "Bonjour " * 50},
+        "services": lambda i: {"title": f"Service {i}", "active": i % 4 != 0},
+        "users": lambda i: {"username": f"user{i}", "email": f"user{i}@test.com", "role": "client"},
+    }
+    for name, factory in documents.items():
+        collection = await get_collection(name)
+        for start in range(0, size, BATCH_SIZE):
+            await collection.insert_many([{
+                **factory(start + i),
+                "id": str(uuid.uuid4()),
+                "created_at": now - timedelta(minutes=start + i),
+            } for i in range(min(BATCH_SIZE, size - start))])
+
+async def legacy_dashboard_stats():
+    """Previous implementation: sequential awaits, full documents, exact counts"""
+    _, articles_count = await get_documents("articles", {}, limit=1)
+    _, contacts_count = await get_documents("contacts", {}, limit=1)
+    _, services_count = await get_documents("services", {"active": True}, limit=1)
+    _, users_count = await get_documents("users", {}, limit=1)
+    recent_contacts, _ = await get_documents("contacts", {}, limit=5, sort_field="created_at", sort_direction=-1)
+    recent_articles, _ = await get_documents("articles", {}, limit=5, sort_field="created_at", sort_direction=-1)
+    return articles_count, contacts_count, services_count, users_count, recent_contacts, recent_articles
+
+async def measure(call):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+async def main(size: int):
+    await connect_to_mongo()
+    try:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        print(f"🌱 Seeding {size} documents per collection...")
+        await seed(size)
+        await ensure_indexes()
+
+        print(f"{'implementation':<16} | {'p50 (ms)':>9} | {'p95 (ms)':>9}")
+        for label, call in [("before", legacy_dashboard_stats), ("after", get_admin_dashboard_stats)]:
+            p50, p95 = await measure(call)
+            print(f"{label:<16} | {p50:>9.1f} | {p95:>9.1f}")
+    finally:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
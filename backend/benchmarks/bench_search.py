@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche d'articles : regex $or contre index texte
+
+Génère un corpus d'articles en français (100k par défaut) dans une base dédiée
+et compare database.search_documents (regex) à search.search_articles
+(index texte, tri par pertinence).
+
+Usage:
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_search.py [100000]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "anomalya_bench")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+from database import connect_to_mongo, close_mongo_connection, get_collection, search_documents, db
+from indexes import ensure_indexes
+from search import search_articles
+
+BATCH_SIZE = 5000
+RUNS = 10
+WORDS = (
+    "développement web application mobile sécurité informatique réseau données "
+    "intelligence artificielle apprentissage automatique serveur cloud hébergement "
+    "maintenance formation conseil entreprise innovation performance optimisation "
+    "déploiement conteneur base de données migration architecture logicielle équipe "
+    "projet client qualité stratégie numérique transformation expérience utilisateur"
+).split()
+QUERIES = ["sécurité", "securite reseau", "intelligence artificielle", "déploiements", "hébergement cloud"]
+
+def sentence(words: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(words))
+
+async def seed(size: int):
+    collection = await get_collection("articles")
+    now = datetime.utcnow()
+    for start in range(0, size, BATCH_SIZE):
+        await collection.insert_many([{
+            "id": str(uuid.uuid4()),
+            "title": sentence(6),
+            "excerpt": sentence(25),
+            "content": sentence(400),
+            "tags": random.sample(WORDS, 3),
+            "category": random.choice(["Tech", "Sécurité", "IA"]),
+            "date": now - timedelta(minutes=start + i),
+            "created_at": now - timedelta(minutes=start + i),
+        } for i in range(min(BATCH_SIZE, size - start))])
+
+async def timed(call):
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+async def main(size: int):
+    await connect_to_mongo()
+    try:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        print(f"🌱 Seeding {size} articles...")
+        await seed(size)
+        await ensure_indexes()
+
+        print(f"{'query':<28} | {'regex p50 (ms)':>14} | {'text p50 (ms)':>13}")
+        for query in QUERIES:
+            regex_ms = await timed(lambda: search_documents(
+                "articles", query, ["title", "excerpt", "content", "tags"], limit=10
+            ))
+            text_ms = await timed(lambda: search_articles(query, limit=10))
+            print(f"{query:<28} | {regex_ms:>14.1f} | {text_ms:>13.1f}")
+    finally:
+        await db.client.drop_database(os.environ["DB_NAME"])
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
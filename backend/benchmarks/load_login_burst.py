@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test de charge : latence de /api/news pendant une rafale de connexions
+
+Mesure la latence de /api/news au repos, puis pendant qu'une rafale de
+connexions (bcrypt) est traitée. Avec le hachage hors de la boucle
+d'événements, les deux séries doivent rester proches. Affiche ensuite les
+métriques de file d'attente de /api/admin/system/metrics.
+
+Usage (serveur démarré, compte admin par défaut) :
+    API_URL=http://localhost:8001 python benchmarks/load_login_burst.py [200]
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_URL = os.environ.get("API_URL", "http://localhost:8001").rstrip("/")
+USERNAME = os.environ.get("BENCH_USERNAME", "admin")
+PASSWORD = os.environ.get("BENCH_PASSWORD", "admin123")
+LOGIN_CONCURRENCY = 32
+NEWS_SAMPLES = 50
+
+def percentile(values: list, rank: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * rank))]
+
+def sample_news(count: int = None, stop: threading.Event = None) -> list:
+    """Time /api/news requests, `count` of them or until `stop` is set"""
+    timings = []
+    with requests.Session() as session:
+        while (stop is None and len(timings) < count) or (stop is not None and not stop.is_set()):
+            started = time.perf_counter()
+            session.get(f"{API_URL}/api/news", params={"limit": 10}).raise_for_status()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def login(_):
+    response = requests.post(
+        f"{API_URL}/api/auth/login",
+        json={"username": USERNAME, "password": PASSWORD}
+    )
+    return response.status_code
+
+def report(label: str, timings: list):
+    print(
+        f"{label:<16} | n={len(timings):>4} | p50={statistics.median(timings):>7.1f} ms | "
+        f"p95={percentile(timings, 0.95):>7.1f} ms | max={max(timings):>7.1f} ms"
+    )
+
+def main(logins: int):
+    report("news (idle)", sample_news(count=NEWS_SAMPLES))
+
+    stop = threading.Event()
+    with ThreadPoolExecutor(1) as sampler:
+        news_during_burst = sampler.submit(sample_news, stop=stop)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(LOGIN_CONCURRENCY) as pool:
+            statuses = list(pool.map(login, range(logins)))
+        burst_seconds = time.perf_counter() - started
+        stop.set()
+        report("news (logins)", news_during_burst.result())
+
+    failed = sum(1 for status in statuses if status != 200)
+    print(f"{logins} logins in {burst_seconds:.1f} s ({failed} failed)")
+
+    token = requests.post(
+        f"{API_URL}/api/auth/login",
+        json={"username": USERNAME, "password": PASSWORD}
+    ).json().get("access_token")
+    metrics = requests.get(
+        f"{API_URL}/api/admin/system/metrics",
+        headers={"Authorization": f"Bearer {token}"}
+    ).json()
+    print(f"password hashing: {metrics.get('passwordHashing')}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
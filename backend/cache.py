@@ -0,0 +1,315 @@
+"""
+Response cache for public read endpoints.
+
+Entries are grouped by namespace (the part of the key before the first ':'),
+each namespace having its own TTL. Write handlers call `invalidate()` with
+the namespaces they change so readers never wait for a TTL to expire.
+
+The storage backend is pluggable: an in-process LRU (default) or Redis
+(CACHE_BACKEND=redis). Invalidations are also published on an invalidation
+bus so that every uvicorn worker or replica evicts its own entries; the bus
+uses Redis pub/sub when REDIS_URL is set and an in-process stand-in
+otherwise.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi.encoders import jsonable_encoder
+
+# TTL (seconds) per namespace
+CACHE_TTLS = {
+    "services": 300,
+    "testimonials": 300,
+    "competences": 600,
+    "faq": 600,
+    "news": 120,
+    "dashboard": 5,
+}
+DEFAULT_TTL = int(os.environ.get("CACHE_TTL", "60"))
+MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "512"))
+INVALIDATION_CHANNEL = "anomalya:cache:invalidate"
+
+MISSING = object()
+
+class MemoryCache:
+    """Size-bounded LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
+
+# ===== BACKENDS =====
+
+class MemoryBackend:
+    """Per-process storage"""
+    name = "memory"
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.store = MemoryCache(max_entries)
+
+    async def get(self, key: str):
+        return self.store.get(key)
+
+    async def set(self, key: str, value, ttl: float):
+        self.store.set(key, value, ttl)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        return self.store.delete_prefix(prefix)
+
+    def stats(self) -> dict:
+        return {"backend": self.name, **self.store.stats()}
+
+class RedisBackend:
+    """Storage shared by every worker through Redis (values are JSON)"""
+    name = "redis"
+
+    def __init__(self, client, key_prefix: str = "anomalya:cache:"):
+        self.client = client
+        self.key_prefix = key_prefix
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str):
+        raw = await self.client.get(self.key_prefix + key)
+        if raw is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value, ttl: float):
+        await self.client.set(self.key_prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    async def delete_prefix(self, prefix: str) -> int:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.key_prefix}{prefix}*")]
+        if keys:
+            await self.client.delete(*keys)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
+
+# ===== INVALIDATION BUS =====
+
+class LocalInvalidationBus:
+    """In-process stand-in for the pub/sub bus (single worker, tests)"""
+
+    def __init__(self):
+        self.handlers = []
+
+    def subscribe(self, handler):
+        self.handlers.append(handler)
+
+    async def publish(self, namespaces: list):
+        for handler in self.handlers:
+            await handler(namespaces)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+class RedisInvalidationBus:
+    """Broadcast invalidations to every worker through Redis pub/sub"""
+
+    def __init__(self, client, channel: str = INVALIDATION_CHANNEL):
+        self.client = client
+        self.channel = channel
+        self.origin = str(uuid.uuid4())
+        self.handlers = []
+        self._task = None
+
+    def subscribe(self, handler):
+        self.handlers.append(handler)
+
+    async def publish(self, namespaces: list):
+        # Local handlers run immediately, the other workers get the message
+        for handler in self.handlers:
+            await handler(namespaces)
+        await self.client.publish(self.channel, json.dumps({
+            "origin": self.origin,
+            "namespaces": namespaces
+        }))
+
+    async def start(self):
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen(pubsub))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen(self, pubsub):
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if payload.get("origin") == self.origin:
+                    continue
+                for handler in self.handlers:
+                    await handler(payload.get("namespaces", []))
+        finally:
+            await pubsub.unsubscribe(self.channel)
+
+# ===== MODULE API =====
+
+backend = MemoryBackend()
+bus = LocalInvalidationBus()
+
+# Namespaces held only by in-process caches, never stored in the backend
+_local_namespaces = set()
+
+async def _evict_namespaces(namespaces: list):
+    for namespace in namespaces:
+        if namespace.split(":", 1)[0] in _local_namespaces:
+            continue
+        await backend.delete_prefix(f"{namespace}:")
+
+_handlers = [_evict_namespaces]
+bus.subscribe(_evict_namespaces)
+
+def on_invalidate(handler, namespace: str = None):
+    """Also call `handler(namespaces)` on every invalidation (other in-process caches)
+
+    A `namespace` owned by the handler is only published on the bus: its
+    invalidations skip the backend (no prefix scan of a shared Redis).
+    """
+    if namespace:
+        _local_namespaces.add(namespace)
+    _handlers.append(handler)
+    bus.subscribe(handler)
+
+def configure_cache(new_backend, new_bus):
+    """Replace the backend and the invalidation bus (startup, tests)"""
+    global backend, bus
+    backend = new_backend
+    bus = new_bus
+    for handler in _handlers:
+        bus.subscribe(handler)
+
+async def start_cache():
+    """Select the backend from the environment and start listening for invalidations"""
+    redis_url = os.environ.get("REDIS_URL")
+    cache_backend = os.environ.get("CACHE_BACKEND", "memory")
+    max_entries = int(os.environ.get("CACHE_MAX_ENTRIES", str(MAX_ENTRIES)))
+
+    if redis_url:
+        import redis.asyncio as redis
+
+        client = redis.from_url(redis_url)
+        configure_cache(
+            RedisBackend(client) if cache_backend == "redis" else MemoryBackend(max_entries),
+            RedisInvalidationBus(client)
+        )
+    else:
+        configure_cache(MemoryBackend(max_entries), LocalInvalidationBus())
+
+    try:
+        await bus.start()
+    except Exception as e:
+        # Redis unavailable: keep serving with a per-process cache
+        print(f"Cache invalidation bus unavailable, using in-process cache: {str(e)}")
+        configure_cache(MemoryBackend(max_entries), LocalInvalidationBus())
+
+async def stop_cache():
+    await bus.stop()
+
+def ttl_for(key: str) -> int:
+    default_ttl = int(os.environ.get("CACHE_TTL", str(DEFAULT_TTL)))
+    return CACHE_TTLS.get(key.split(":", 1)[0], default_ttl)
+
+async def cached(key: str, loader, ttl: int = None):
+    """Return the cached value for `key`, calling `loader()` on a miss"""
+    try:
+        value = await backend.get(key)
+    except Exception as e:
+        print(f"Cache read failed: {str(e)}")
+        value = MISSING
+    if value is not MISSING:
+        return value
+
+    # Stored in serialized form, independent of the loaded documents
+    value = jsonable_encoder(await loader())
+    try:
+        await backend.set(key, value, ttl or ttl_for(key))
+    except Exception as e:
+        print(f"Cache write failed: {str(e)}")
+    return value
+
+async def invalidate(*namespaces: str):
+    """Drop every entry of the given namespaces, in every worker"""
+    try:
+        await bus.publish(list(namespaces))
+    except Exception as e:
+        print(f"Cache invalidation failed: {str(e)}")
+        for handler in _handlers:
+            await handler(list(namespaces))
+
+def cache_stats() -> dict:
+    return backend.stats()
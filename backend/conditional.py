@@ -0,0 +1,112 @@
+"""
+Conditional GET helpers (ETag / Last-Modified).
+
+Validators are derived from document versions (`updated_at`, falling back to
+`created_at`) so a request carrying `If-None-Match` or `If-Modified-Since`
+can be answered with 304 before the full payload is loaded. List versions
+are cached under `<namespace>:version`, so they are dropped by the same
+`invalidate()` calls as the cached lists themselves.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from database import get_collection, get_document
+from cache import cached
+
+CACHE_CONTROL = "no-cache"  # Always revalidate, never re-download unchanged content
+
+def document_version(document: dict):
+    return document.get("updated_at") or document.get("created_at")
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def _as_utc(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        return date.replace(tzinfo=timezone.utc)
+    return date.astimezone(timezone.utc)
+
+def http_date(date: datetime) -> str:
+    return format_datetime(_as_utc(date), usegmt=True)
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime = None) -> bool:
+    """Evaluate If-None-Match (preferred) then If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" matches "x"
+        normalized = {tag[2:] if tag.startswith("W/") else tag for tag in candidates}
+        return "*" in candidates or etag[2:] in normalized
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have a one second resolution
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    return False
+
+def validator_headers(etag: str, last_modified: datetime = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+def not_modified(etag: str, last_modified: datetime = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
+
+def set_validators(response: Response, etag: str, last_modified: datetime = None):
+    response.headers.update(validator_headers(etag, last_modified))
+
+def _parse_date(value):
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+async def document_validators(collection_name: str, document_id: str):
+    """ETag and Last-Modified of one document, or None if it does not exist
+
+    Only `id` and the timestamps are read, never the document body.
+    """
+    version = await get_document(
+        collection_name,
+        document_id,
+        {"_id": 0, "id": 1, "updated_at": 1, "created_at": 1}
+    )
+    if not version:
+        return None
+    last_modified = document_version(version)
+    return make_etag(collection_name, document_id, last_modified), last_modified
+
+async def list_validators(namespace: str, collection_name: str, filter_dict: dict = None, *params):
+    """ETag and Last-Modified of a list response, `params` being its query parameters"""
+    version = await cached(
+        f"{namespace}:version",
+        lambda: collection_version(collection_name, filter_dict)
+    )
+    last_modified = _parse_date(version["last_modified"])
+    return make_etag(namespace, last_modified, version["count"], *params), last_modified
+
+async def collection_version(collection_name: str, filter_dict: dict = None) -> dict:
+    """Most recent modification and document count, used to validate list responses"""
+    collection = await get_collection(collection_name)
+    latest = await collection.find_one(
+        filter_dict or {},
+        {"_id": 0, "updated_at": 1, "created_at": 1},
+        sort=[("updated_at", -1)]
+    )
+    if filter_dict:
+        count = await collection.count_documents(filter_dict)
+    else:
+        count = await collection.estimated_document_count()
+    return {
+        "last_modified": document_version(latest) if latest else None,
+        "count": count
+    }
@@ -4,7 +4,6 @@ Script pour créer des notifications de test
 import asyncio
 import sys
 from pathlib import Path
-from datetime import datetime
 import uuid
 
 # Add backend directory to path
@@ -12,6 +11,7 @@ backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
 from database import create_document
+from notification_retention import retention_fields
 
 async def create_test_notifications():
     """Créer des notifications de test"""
@@ -24,7 +24,7 @@ async def create_test_notifications():
             "message": "Jean Dupont (jean.dupont@example.com) vient de s'inscrire sur la plateforme",
             "link": "/admin/users",
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("NEW_USER"),
             "createdBy": "system"
         },
         {
@@ -34,7 +34,7 @@ async def create_test_notifications():
             "message": "Marie Martin a envoyé un message: Demande d'information sur vos services de développement web",
             "link": "/admin/contacts",
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("NEW_CONTACT"),
             "createdBy": "system"
         },
         {
@@ -44,7 +44,7 @@ async def create_test_notifications():
             "message": "Paul Durand a demandé un devis pour: Développement d'application mobile",
             "link": "/admin/quotes",
             "read": True,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("NEW_QUOTE"),
             "createdBy": "system"
         },
         {
@@ -54,7 +54,7 @@ async def create_test_notifications():
             "message": "Le système a été mis à jour avec de nouvelles fonctionnalités de gestion de contenu et notifications",
             "link": "/admin/settings",
             "read": True,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("SYSTEM_UPDATE"),
             "createdBy": "system"
         },
         {
@@ -64,7 +64,7 @@ async def create_test_notifications():
             "message": "Sophie Leroy a créé un ticket: Problème de connexion à son compte client",
             "link": "/admin/tickets",
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("NEW_TICKET"),
             "createdBy": "system"
         },
         {
@@ -74,7 +74,7 @@ async def create_test_notifications():
             "message": "Détection de tentatives de connexion suspectes sur plusieurs comptes. Surveillance renforcée activée.",
             "link": "/admin/security",
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields("SECURITY_ALERT"),
             "createdBy": "system"
         }
     ]
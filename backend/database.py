@@ -1,8 +1,14 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import json_util
 from typing import Optional
+import base64
 import os
+import re
 from datetime import datetime
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded"""
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
@@ -39,20 +45,36 @@ async def create_document(collection_name: str, document: dict):
     document['created_at'] = datetime.utcnow()
     document['updated_at'] = datetime.utcnow()
     result = await collection.insert_one(document)
+    
+    # Keep the daily analytics counters up to date
+    try:
+        from rollups import record_creation
+        await record_creation(collection_name, document['created_at'])
+    except Exception as e:
+        print(f"Rollup update failed: {str(e)}")
+        # Don't fail the write if the counters can't be updated
+    
     return str(result.inserted_id)
 
-async def get_document(collection_name: str, document_id: str):
+async def get_document(collection_name: str, document_id: str, projection: dict = None):
     collection = await get_collection(collection_name)
-    return await collection.find_one({"id": document_id})
+    return await collection.find_one({"id": document_id}, projection)
 
 async def get_documents(collection_name: str, filter_dict: dict = None, 
-                       skip: int = 0, limit: int = 100, sort_field: str = None, sort_direction: int = -1):
+                       skip: int = 0, limit: int = 100, sort_field: str = None, sort_direction: int = -1,
+                       count: str = "exact", projection: dict = None):
+    """Find documents and optionally count the matches
+    
+    count: "exact" (count_documents), "estimated" (collection metadata, only
+    valid without filter) or "none" (total is returned as None).
+    projection: fields to return (MongoDB projection), all fields when None.
+    """
     collection = await get_collection(collection_name)
     
     if filter_dict is None:
         filter_dict = {}
     
-    cursor = collection.find(filter_dict)
+    cursor = collection.find(filter_dict, projection)
     
     if sort_field:
         cursor = cursor.sort(sort_field, sort_direction)
@@ -60,10 +82,126 @@ async def get_documents(collection_name: str, filter_dict: dict = None,
     cursor = cursor.skip(skip).limit(limit)
     
     documents = await cursor.to_list(length=limit)
-    total = await collection.count_documents(filter_dict)
+    total = await _count_matches(collection, filter_dict, count)
     
     return documents, total
 
+async def get_documents_page(collection_name: str, filter_dict: dict = None, limit: int = 100,
+                             cursor: str = None, sort_field: str = "created_at", sort_direction: int = -1,
+                             count: str = "none", projection: dict = None):
+    """Keyset pagination on (sort_field, id)
+    
+    Returns (documents, next_cursor, total). Deep pages cost the same as the
+    first one because no documents are skipped. Raises InvalidCursorError on
+    an invalid cursor. A projection must keep sort_field and id.
+    """
+    collection = await get_collection(collection_name)
+    
+    if filter_dict is None:
+        filter_dict = {}
+    
+    query = filter_dict
+    if cursor:
+        position = decode_cursor(cursor)
+        comparison = "$lt" if sort_direction < 0 else "$gt"
+        keyset = {"$or": [
+            {sort_field: {comparison: position["v"]}},
+            {sort_field: position["v"], "id": {comparison: position["id"]}}
+        ]}
+        query = {"$and": [filter_dict, keyset]} if filter_dict else keyset
+    
+    find_cursor = collection.find(query, projection).sort(
+        [(sort_field, sort_direction), ("id", sort_direction)]
+    ).limit(limit + 1)
+    documents = await find_cursor.to_list(length=limit + 1)
+    
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        next_cursor = encode_cursor({"v": last.get(sort_field), "id": last.get("id")})
+    
+    total = await _count_matches(collection, filter_dict, count)
+    
+    return documents, next_cursor, total
+
+async def _count_matches(collection, filter_dict: dict, count: str):
+    if count == "exact":
+        return await collection.count_documents(filter_dict)
+    if count == "estimated":
+        if filter_dict:
+            raise ValueError("Estimated counts cannot be filtered")
+        return await collection.estimated_document_count()
+    return None
+
+def encode_cursor(position: dict) -> str:
+    """Opaque pagination cursor (keeps datetime values intact)"""
+    return base64.urlsafe_b64encode(json_util.dumps(position).encode()).decode()
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        position = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor")
+    if not isinstance(position, dict) or "v" not in position or "id" not in position:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return position
+
+async def count_documents(collection_name: str, filter_dict: dict = None, estimated: bool = False):
+    collection = await get_collection(collection_name)
+    
+    # estimated_document_count reads collection metadata and ignores filters
+    if estimated and not filter_dict:
+        return await collection.estimated_document_count()
+    
+    return await collection.count_documents(filter_dict or {})
+
+async def aggregate_documents(collection_name: str, pipeline: list, length: int = None):
+    collection = await get_collection(collection_name)
+    cursor = collection.aggregate(pipeline)
+    return await cursor.to_list(length=length)
+
+async def count_by_field(collection_name: str, field: str, values: list, filter_dict: dict = None):
+    """Count documents per value of `field` for a whole page in one aggregation"""
+    if not values:
+        return {}
+    
+    match = dict(filter_dict or {})
+    match[field] = {"$in": list(set(values))}
+    
+    rows = await aggregate_documents(collection_name, [
+        {"$match": match},
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}}
+    ])
+    return {row["_id"]: row["count"] for row in rows}
+
+async def join_documents(documents: list, local_field: str, collection_name: str,
+                         field_map: dict, foreign_field: str = "id"):
+    """Attach fields of related documents to a page of results with a single $in query
+    
+    field_map maps the key set on each document to the field read from the
+    related document, e.g. {"client_name": "full_name"}.
+    """
+    keys = list({doc[local_field] for doc in documents if doc.get(local_field) is not None})
+    if not keys:
+        return documents
+    
+    collection = await get_collection(collection_name)
+    projection = {"_id": 0, foreign_field: 1}
+    for source_field in field_map.values():
+        projection[source_field] = 1
+    
+    cursor = collection.find({foreign_field: {"$in": keys}}, projection)
+    related = {doc[foreign_field]: doc for doc in await cursor.to_list(length=len(keys))}
+    
+    for doc in documents:
+        match = related.get(doc.get(local_field))
+        if match:
+            for target_field, source_field in field_map.items():
+                doc[target_field] = match.get(source_field)
+    
+    return documents
+
 async def update_document(collection_name: str, document_id: str, update_dict: dict):
     collection = await get_collection(collection_name)
     update_dict['updated_at'] = datetime.utcnow()
@@ -79,19 +217,21 @@ async def delete_document(collection_name: str, document_id: str):
     return result.deleted_count > 0
 
 async def search_documents(collection_name: str, search_query: str, 
-                          search_fields: list, skip: int = 0, limit: int = 100):
+                          search_fields: list, skip: int = 0, limit: int = 100,
+                          projection: dict = None):
     collection = await get_collection(collection_name)
     
-    # Create text search query
+    # Create text search query (user input is matched literally)
+    pattern = re.escape(search_query)
     search_conditions = []
     for field in search_fields:
         search_conditions.append({
-            field: {"$regex": search_query, "$options": "i"}
+            field: {"$regex": pattern, "$options": "i"}
         })
     
     filter_dict = {"$or": search_conditions} if search_conditions else {}
     
-    cursor = collection.find(filter_dict).sort("created_at", -1).skip(skip).limit(limit)
+    cursor = collection.find(filter_dict, projection).sort("created_at", -1).skip(skip).limit(limit)
     documents = await cursor.to_list(length=limit)
     total = await collection.count_documents(filter_dict)
     
@@ -0,0 +1,287 @@
+"""
+Image processing off the event loop.
+
+Decoding, resizing and encoding images is CPU-bound and holds the GIL, so it
+runs on a process pool. Uploads store the original and return right away
+with `thumbnailStatus: "pending"`; each stored content (keyed by its SHA-256,
+so duplicate uploads share the work) is decoded once in a worker, which reads
+its dimensions and writes the thumbnail and the responsive derivatives (a set
+of widths in AVIF when Pillow supports it, WebP and JPEG) in the same pass,
+then every `media_files` document of that content is marked ready (or
+failed). `choose_variant` picks the derivative to serve for an `Accept`
+header. Images left pending by a restart are resubmitted at startup by
+`resume_pending()`.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+THUMBNAIL_SIZE = (300, 300)
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+DEFAULT_THUMBNAIL = "/api/media/default-thumbnail.png"
+THUMBNAIL_URL_PREFIX = "/api/media/thumbnails/"
+FILES_URL_PREFIX = "/api/media/files/"
+DERIVATIVE_DIRNAME = "derivatives"
+DEFAULT_DERIVATIVE_WIDTHS = "480,960,1600"
+
+# Preferred first; JPEG is the fallback every client accepts
+DERIVATIVE_FORMATS = {
+    "avif": {"format": "AVIF", "extension": "avif", "contentType": "image/avif", "options": {"quality": 55}},
+    "webp": {"format": "WEBP", "extension": "webp", "contentType": "image/webp", "options": {"quality": 80, "method": 4}},
+    "jpeg": {"format": "JPEG", "extension": "jpg", "contentType": "image/jpeg", "options": {"quality": 82, "progressive": True}},
+}
+
+def thumbnail_filename(sha256: str) -> str:
+    return f"thumb_{sha256}.jpg"
+
+def derivative_widths() -> list:
+    # Read lazily: the .env file is loaded after the modules are imported
+    widths = os.environ.get("IMAGE_DERIVATIVE_WIDTHS", DEFAULT_DERIVATIVE_WIDTHS)
+    return sorted({int(width) for width in widths.split(",") if width.strip()})
+
+def derivative_formats() -> list:
+    """Formats this Pillow build can encode (AVIF needs Pillow built with libavif)"""
+    return [
+        name for name in DERIVATIVE_FORMATS
+        if name != "avif" or ("avif" in features.modules and features.check_module("avif"))
+    ]
+
+def parse_accept(accept: str) -> dict:
+    """Accept header as {media type: q}"""
+    accepted = {}
+    for part in (accept or "").split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[media_type.lower()] = q
+    return accepted
+
+def accepted_formats(accept: str, available) -> list:
+    """Formats of `available` accepted by the client, best q first, then in DERIVATIVE_FORMATS order
+
+    AVIF and WebP must be listed explicitly; JPEG is also accepted through
+    image/* or */*, or without an Accept header. Formats with q=0 are refused.
+    """
+    accepted = parse_accept(accept)
+    ranked = []
+    for order, name in enumerate(DERIVATIVE_FORMATS):
+        if name not in available:
+            continue
+        q = accepted.get(DERIVATIVE_FORMATS[name]["contentType"])
+        if q is None and name == "jpeg":
+            q = accepted.get("image/*", accepted.get("*/*", None if accepted else 1.0))
+        if q:
+            ranked.append((-q, order, name))
+    return [name for _, _, name in sorted(ranked)]
+
+def choose_variant(derivatives: list, accept: str, width: int = None):
+    """Best derivative for an Accept header: preferred format, smallest width covering `width`"""
+    available = {derivative["format"] for derivative in derivatives}
+    chosen_format = next(iter(accepted_formats(accept, available)), None)
+    candidates = sorted(
+        (derivative for derivative in derivatives if derivative["format"] == chosen_format),
+        key=lambda derivative: derivative["width"]
+    )
+    if not candidates:
+        return None
+    if width:
+        return next((derivative for derivative in candidates if derivative["width"] >= width), candidates[-1])
+    return candidates[-1]
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """RGB copy for JPEG, transparent areas on white"""
+    if img.mode != "RGBA":
+        return img
+    background = Image.new("RGB", img.size, "white")
+    background.paste(img, mask=img.getchannel("A"))
+    return background
+
+def process_image(source_path: str, thumbnail_path: str, derivative_dir: str = None,
+                  widths: list = (), formats: list = (), size: tuple = THUMBNAIL_SIZE) -> dict:
+    """Decode an image once: dimensions, derivatives and JPEG thumbnail (runs in a worker process)
+
+    Derivatives wider than the original are not generated (the original width
+    is used instead). Animated images only get a thumbnail.
+    """
+    with Image.open(source_path) as img:
+        dimensions = {"width": img.width, "height": img.height}
+        if getattr(img, "is_animated", False):
+            widths = ()
+        targets = sorted({min(width, img.width) for width in widths}, reverse=True)
+
+        # JPEG: let the decoder downscale by a power of two while decoding
+        largest = max([size[0] * 2, *targets])
+        img.draft("RGB", (largest, max(1, round(img.height * largest / img.width))))
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        current = img.convert("RGBA" if has_alpha else "RGB")
+
+    derivatives = []
+    if targets:
+        os.makedirs(derivative_dir, exist_ok=True)
+    for width in targets:
+        height = max(1, round(dimensions["height"] * width / dimensions["width"]))
+        if current.size != (width, height):
+            # Each width is resized from the previous (larger) one
+            current = current.resize((width, height), Image.Resampling.LANCZOS)
+        for name in formats:
+            spec = DERIVATIVE_FORMATS[name]
+            filename = f"{width}.{spec['extension']}"
+            path = os.path.join(derivative_dir, filename)
+            output = _flatten(current) if name == "jpeg" else current
+            output.save(path, spec["format"], **spec["options"])
+            derivatives.append({
+                "width": width,
+                "height": height,
+                "format": name,
+                "filename": filename,
+                "size": os.path.getsize(path)
+            })
+
+    thumbnail = _flatten(current)
+    thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+    thumbnail.save(thumbnail_path, "JPEG", quality=85)
+    return {"dimensions": dimensions, "derivatives": derivatives}
+
+FIT_MODES = ("contain", "cover")
+
+def resize_image(source_path: str, output_path: str, width: int = None, height: int = None,
+                 fit: str = "contain", format_name: str = "jpeg"):
+    """Write one resized variant (runs in a worker process)
+
+    contain: fit inside width x height; cover: fill width x height, cropping
+    the overflow. Images are never enlarged.
+    """
+    with Image.open(source_path) as img:
+        original = img.size
+        ratios = [target / size for target, size in ((width, original[0]), (height, original[1])) if target]
+        scale = min(1, (max if fit == "cover" and len(ratios) == 2 else min)(ratios, default=1))
+        decoded = (max(1, round(original[0] * scale)), max(1, round(original[1] * scale)))
+
+        # JPEG: let the decoder downscale by a power of two while decoding
+        img.draft("RGB", decoded)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        current = img.convert("RGBA" if has_alpha else "RGB")
+
+    if fit == "cover" and width and height:
+        crop = (min(width, original[0]), min(height, original[1]))
+        current = ImageOps.fit(current, crop, Image.Resampling.LANCZOS)
+    elif current.size != decoded:
+        current = current.resize(decoded, Image.Resampling.LANCZOS)
+
+    spec = DERIVATIVE_FORMATS[format_name]
+    output = _flatten(current) if format_name == "jpeg" else current
+    output.save(output_path, spec["format"], **spec["options"])
+
+class ImageProcessor:
+    """Process pool for image jobs, results written back to media_files"""
+
+    def __init__(self, max_workers: int = None):
+        self._max_workers = max_workers
+        self._executor = None
+        self._tasks = {}  # sha256 -> task, one job per stored content
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def max_workers(self) -> int:
+        # Read lazily: the .env file is loaded after the modules are imported
+        return self._max_workers or int(os.environ.get("IMAGE_PROCESSING_WORKERS", str(DEFAULT_WORKERS)))
+
+    def _pool(self):
+        if self._executor is None:
+            # spawn: don't fork a process holding the event loop and Mongo connections
+            self._executor = ProcessPoolExecutor(
+                self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, function, *args):
+        """Run an image function on the pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), function, *args)
+
+    def submit(self, sha256: str, source_path: Path, upload_dir: Path, thumbnail_dir: Path):
+        """Schedule the thumbnail and derivatives of a stored image, returns immediately
+
+        A content already being processed is not scheduled twice.
+        """
+        task = self._tasks.get(sha256)
+        if task is None:
+            task = asyncio.create_task(self._process(sha256, source_path, upload_dir, thumbnail_dir))
+            self._tasks[sha256] = task
+            task.add_done_callback(lambda _: self._tasks.pop(sha256, None))
+        return task
+
+    def is_processing(self, sha256: str) -> bool:
+        """Whether a job of this content is running in this process"""
+        return sha256 in self._tasks
+
+    async def _process(self, sha256: str, source_path: Path, upload_dir: Path, thumbnail_dir: Path):
+        from database import get_collection
+
+        filename = thumbnail_filename(sha256)
+        derivative_path = f"{DERIVATIVE_DIRNAME}/{sha256}"
+        try:
+            result = await self.run(
+                process_image, str(source_path), str(thumbnail_dir / filename),
+                str(upload_dir / derivative_path), derivative_widths(), derivative_formats()
+            )
+            derivatives = []
+            for derivative in result["derivatives"]:
+                path = f"{derivative_path}/{derivative.pop('filename')}"
+                derivatives.append({**derivative, "path": path, "url": f"{FILES_URL_PREFIX}{path}"})
+            update = {
+                "thumbnail": f"{THUMBNAIL_URL_PREFIX}{filename}",
+                "thumbnailStatus": "ready",
+                "dimensions": result["dimensions"],
+                "derivatives": derivatives
+            }
+            self.completed += 1
+        except Exception as e:
+            print(f"Erreur traitement image: {e}")
+            update = {"thumbnail": DEFAULT_THUMBNAIL, "thumbnailStatus": "failed"}
+            self.failed += 1
+
+        # Every media sharing this content
+        collection = await get_collection("media_files")
+        update["updated_at"] = datetime.utcnow()
+        await collection.update_many({"sha256": sha256}, {"$set": update})
+
+    async def resume_pending(self, upload_dir: Path, thumbnail_dir: Path) -> int:
+        """Resubmit images whose processing was still pending at shutdown"""
+        from database import get_collection
+
+        collection = await get_collection("media_files")
+        cursor = collection.find({"thumbnailStatus": "pending"}, {"_id": 0, "sha256": 1, "safeName": 1})
+        resumed = 0
+        async for file_data in cursor:
+            self.submit(file_data["sha256"], upload_dir / file_data["safeName"], upload_dir, thumbnail_dir)
+            resumed += 1
+        return resumed
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": len(self._tasks),
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+image_processor = ImageProcessor()
@@ -0,0 +1,232 @@
+"""
+On-demand image variants.
+
+`/api/media/files/{name}?w=&h=&fit=&fmt=` serves a resized copy of an
+uploaded image, generated on the image process pool the first time it is
+requested. `{name}` is the stored file name (as in the `url` of media_files)
+or the media id. Variants are kept in a disk cache under uploads/resized,
+bounded by total size (IMAGE_CACHE_MAX_BYTES) with least recently used
+eviction; concurrent requests for the same variant share one generation.
+Requests without resize parameters are served by StaticFiles as before.
+"""
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from fastapi.staticfiles import StaticFiles
+
+from image_processing import (
+    image_processor, resize_image, derivative_formats, accepted_formats, DERIVATIVE_FORMATS, FIT_MODES
+)
+from database import get_document
+from conditional import make_etag, is_not_modified
+
+UPLOAD_DIR = Path("uploads")
+RESIZED_DIRNAME = "resized"
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+MAX_DIMENSION = 4096
+RESIZE_PARAMS = ("w", "h", "fit", "fmt")
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+class ResizeCache:
+    """Disk cache of generated variants, LRU by total bytes, one generation per key"""
+
+    def __init__(self, directory: Path, max_bytes: int = None):
+        self.directory = directory
+        self._max_bytes = max_bytes
+        self._entries = None  # key -> size, least recently used first
+        self._inflight = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        # Read lazily: the .env file is loaded after the modules are imported
+        return self._max_bytes or int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(DEFAULT_CACHE_MAX_BYTES)))
+
+    def _index(self) -> OrderedDict:
+        """Variants already on disk (previous runs, other workers), oldest first"""
+        if self._entries is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.is_file() and not entry.name.startswith(".")),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            self._entries = OrderedDict((entry.name, entry.stat().st_size) for entry in files)
+            self.total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def _evict(self):
+        entries = self._index()
+        while self.total_bytes > self.max_bytes and len(entries) > 1:
+            key, size = entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.unlink(self.directory / key)
+            except FileNotFoundError:
+                pass
+
+    async def get_or_create(self, key: str, generate) -> Path:
+        """Path of the cached variant `key`, calling `await generate(path)` on a miss"""
+        entries = self._index()
+        path = self.directory / key
+        if key in entries:
+            if path.exists():
+                self.hits += 1
+                entries.move_to_end(key)
+                os.utime(path)  # Recency survives restarts
+                return path
+            # Evicted by another worker
+            self.total_bytes -= entries.pop(key)
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._generate(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A client going away must not cancel the generation shared with the others
+        return await asyncio.shield(task)
+
+    async def _generate(self, key: str, generate) -> Path:
+        path = self.directory / key
+        temp_path = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        try:
+            await generate(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        entries = self._index()
+        size = path.stat().st_size
+        self.total_bytes += size - entries.pop(key, 0)
+        entries[key] = size
+        self._evict()
+        return path
+
+    def discard(self, stored_name: str) -> int:
+        """Remove the cached variants of a stored file"""
+        entries = self._index()
+        removed = 0
+        for path in self.directory.glob(f"{Path(stored_name).stem}_*"):
+            self.total_bytes -= entries.pop(path.name, 0)
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self) -> dict:
+        entries = self._index()
+        return {
+            "entries": len(entries),
+            "bytes": self.total_bytes,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight)
+        }
+
+def parse_resize_params(query_string: bytes) -> dict:
+    """Validated w/h/fit/fmt, None without resize parameters; raises ValueError"""
+    query = {key: values[-1] for key, values in parse_qs(query_string.decode("latin-1")).items()}
+    if not any(param in query for param in RESIZE_PARAMS):
+        return None
+
+    params = {"fit": query.get("fit", "contain"), "fmt": query.get("fmt", "auto")}
+    for name in ("w", "h"):
+        value = query.get(name)
+        if value is None:
+            params[name] = None
+            continue
+        if not value.isdigit() or not 1 <= int(value) <= MAX_DIMENSION:
+            raise ValueError(f"{name} doit être un entier entre 1 et {MAX_DIMENSION}")
+        params[name] = int(value)
+    if params["fit"] not in FIT_MODES:
+        raise ValueError(f"fit doit valoir {', '.join(FIT_MODES)}")
+    if params["fmt"] != "auto" and params["fmt"] not in derivative_formats():
+        raise ValueError(f"fmt doit valoir auto, {', '.join(derivative_formats())}")
+    return params
+
+def negotiated_format(accept: str) -> str:
+    """Preferred format accepted by the client, JPEG otherwise"""
+    return next(iter(accepted_formats(accept, derivative_formats())), "jpeg")
+
+resize_cache = ResizeCache(UPLOAD_DIR / RESIZED_DIRNAME)
+
+class MediaFiles(StaticFiles):
+    """StaticFiles for uploads, with on-demand resized variants of images"""
+
+    async def get_response(self, path: str, scope) -> Response:
+        try:
+            params = parse_resize_params(scope.get("query_string", b""))
+        except ValueError as e:
+            return JSONResponse({"detail": str(e)}, status_code=400)
+        if params is None or "/" in path:
+            return await super().get_response(path, scope)
+
+        source = await self._source_path(path)
+        if source is None:
+            return JSONResponse({"detail": "Image non trouvée"}, status_code=404)
+
+        request = Request(scope)
+        format_name = params["fmt"]
+        if format_name == "auto":
+            format_name = negotiated_format(request.headers.get("accept", ""))
+
+        key = (
+            f"{source.stem}_{params['w'] or 0}x{params['h'] or 0}_{params['fit']}"
+            f".{DERIVATIVE_FORMATS[format_name]['extension']}"
+        )
+        headers = {"ETag": make_etag(key), "Cache-Control": IMAGE_CACHE_CONTROL}
+        if params["fmt"] == "auto":
+            headers["Vary"] = "Accept"
+        if is_not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+        async def generate(output_path: Path):
+            await image_processor.run(
+                resize_image, str(source), str(output_path),
+                params["w"], params["h"], params["fit"], format_name
+            )
+
+        try:
+            variant = await resize_cache.get_or_create(key, generate)
+        except Exception as e:
+            print(f"Erreur redimensionnement image: {e}")
+            return JSONResponse({"detail": "Image illisible"}, status_code=415)
+
+        return FileResponse(
+            variant, media_type=DERIVATIVE_FORMATS[format_name]["contentType"], headers=headers
+        )
+
+    async def _source_path(self, name: str):
+        """Original image for a stored file name or a media id"""
+        full_path, stat_result = self.lookup_path(name)
+        if stat_result is None:
+            file_data = await get_document("media_files", name, {"_id": 0, "type": 1, "safeName": 1})
+            if not file_data or file_data.get("type") != "image":
+                return None
+            full_path, stat_result = self.lookup_path(file_data["safeName"])
+            if stat_result is None:
+                return None
+
+        full_path = Path(full_path)
+        if full_path.suffix.lower() not in IMAGE_EXTENSIONS:
+            return None
+        return full_path
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Declarative index registry.
+
+Every collection queried by the routers declares its indexes here. They are
+ensured idempotently at startup by `ensure_indexes()`. Run this module to
+report missing, undeclared and unused indexes (based on `$indexStats`):
+
+    python indexes.py            # report
+    python indexes.py --ensure   # create missing indexes, then report
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from database import get_collection, aggregate_documents
+
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("username", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("role", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "articles": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("date", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("category", ASCENDING), ("date", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("title", ASCENDING), ("id", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("updated_at", DESCENDING)]),
+        # Full-text search (French stemming, case and accent insensitive)
+        IndexModel(
+            [("title", TEXT), ("excerpt", TEXT), ("content", TEXT), ("tags", TEXT)],
+            weights={"title": 10, "tags": 5, "excerpt": 3, "content": 1},
+            default_language="french",
+            name="articles_text"
+        ),
+    ],
+    "contacts": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "quotes": [
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "quote_requests": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "support_tickets": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "point_transactions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "client_profiles": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING)], unique=True),
+    ],
+    "services": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("active", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("active", ASCENDING), ("updated_at", DESCENDING)]),
+    ],
+    "testimonials": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("active", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+    "competences": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("category", ASCENDING)]),
+    ],
+    "faq": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("active", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("active", ASCENDING), ("updated_at", DESCENDING)]),
+    ],
+    "newsletter": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("active", ASCENDING)]),
+    ],
+    "notifications": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("createdAt", DESCENDING)]),
+        IndexModel([("read", ASCENDING), ("createdAt", DESCENDING)]),
+        IndexModel([("type", ASCENDING), ("createdAt", DESCENDING)]),
+        # TTL: expired notifications are deleted by MongoDB (see notification_retention.py)
+        IndexModel([("expiresAt", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "media_files": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("createdAt", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("folder", ASCENDING), ("createdAt", DESCENDING)]),
+        IndexModel([("type", ASCENDING), ("createdAt", DESCENDING)]),
+        IndexModel([("thumbnailStatus", ASCENDING)]),
+        # Content-addressed storage: duplicate lookup and reference counting
+        IndexModel([("sha256", ASCENDING)]),
+        IndexModel([("safeName", ASCENDING)]),
+    ],
+    "media_blobs": [
+        IndexModel([("sha256", ASCENDING)], unique=True),
+    ],
+    "media_folders": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("path", ASCENDING)], unique=True),
+        IndexModel([("parent", ASCENDING), ("name", ASCENDING)]),
+    ],
+    "daily_rollups": [
+        IndexModel([("day", ASCENDING)], unique=True),
+    ],
+}
+
+def index_name(model: IndexModel) -> str:
+    return model.document["name"]
+
+async def ensure_indexes():
+    """Create every declared index (no-op for the ones that already exist)"""
+    created = 0
+    for collection_name, models in INDEXES.items():
+        collection = await get_collection(collection_name)
+        for model in models:
+            try:
+                await collection.create_indexes([model])
+                created += 1
+            except OperationFailure as e:
+                # Conflicting options or duplicate values for a unique index
+                print(f"⚠️ Index {collection_name}.{index_name(model)} not created: {e}")
+    return created
+
+async def index_report():
+    """Missing, undeclared and unused indexes per collection"""
+    report = {}
+    for collection_name, models in INDEXES.items():
+        collection = await get_collection(collection_name)
+        existing = await collection.index_information()
+        stats = await aggregate_documents(collection_name, [{"$indexStats": {}}])
+        declared = {index_name(model) for model in models}
+
+        report[collection_name] = {
+            "missing": sorted(declared - set(existing)),
+            "undeclared": sorted(set(existing) - declared - {"_id_"}),
+            "unused": sorted(
+                stat["name"] for stat in stats
+                if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0
+            ),
+        }
+    return report
+
+async def main():
+    from database import connect_to_mongo, close_mongo_connection
+
+    try:
+        await connect_to_mongo()
+        if "--ensure" in sys.argv:
+            print("🔧 Ensuring indexes...")
+            await ensure_indexes()
+
+        report = await index_report()
+        for collection_name, entries in report.items():
+            if not any(entries.values()):
+                print(f"✅ {collection_name}")
+                continue
+            print(f"📚 {collection_name}")
+            for label, names in entries.items():
+                for name in names:
+                    print(f"   {label:<10} {name}")
+    except Exception as e:
+        print(f"❌ Error checking indexes: {str(e)}")
+    finally:
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main())
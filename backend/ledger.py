@@ -0,0 +1,143 @@
+"""
+Loyalty points ledger.
+
+Points are applied with a single atomic update pipeline: totals are
+incremented server-side and the loyalty tier is recomputed from the new
+total with `$switch`, so concurrent awards never lose updates. The
+`point_transactions` record is written in the same MongoDB transaction when
+the deployment supports it (replica set / mongos). On a standalone server it
+is written right after the update: if that write fails, the user keeps the
+points without a transaction record, and calling `apply_points` again
+applies them a second time (each call gets a new transaction id).
+"""
+from typing import Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from database import db, get_collection
+from models import PointTransaction
+
+# (minimum total_points, tier), highest first
+LOYALTY_TIERS = [(5000, "platinum"), (2000, "gold"), (500, "silver")]
+DEFAULT_TIER = "bronze"
+BULK_CHUNK_SIZE = 1000
+
+_transactions_supported = None
+
+def tier_expression(total) -> dict:
+    return {"$switch": {
+        "branches": [
+            {"case": {"$gte": [total, threshold]}, "then": tier}
+            for threshold, tier in LOYALTY_TIERS
+        ],
+        "default": DEFAULT_TIER
+    }}
+
+def points_update(points: int) -> list:
+    """Update pipeline applying `points` and recomputing the tier"""
+    return [
+        {"$set": {
+            "total_points": {"$add": [{"$ifNull": ["$total_points", 0]}, points]},
+            "available_points": {"$max": [0, {"$add": [{"$ifNull": ["$available_points", 0]}, points]}]},
+            "updated_at": "$$NOW"
+        }},
+        {"$set": {"loyalty_tier": tier_expression("$total_points")}}
+    ]
+
+def transaction_record(user_id: str, points: int, description: str, created_by: str = None,
+                       transaction_type: str = None, reference_id: str = None) -> dict:
+    return PointTransaction(
+        user_id=user_id,
+        points=points,
+        transaction_type=transaction_type or ("earned" if points > 0 else "spent"),
+        description=description,
+        reference_id=reference_id,
+        created_by=created_by
+    ).dict()
+
+async def transactions_supported() -> bool:
+    """Multi-document transactions need a replica set or a sharded cluster"""
+    global _transactions_supported
+    if _transactions_supported is None:
+        hello = await db.client.admin.command("hello")
+        _transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return _transactions_supported
+
+async def _record_transactions(records: list, session=None):
+    # Upsert by id: the same records written twice (within one call) are stored once
+    collection = await get_collection("point_transactions")
+    await collection.bulk_write(
+        [UpdateOne({"id": record["id"]}, {"$setOnInsert": record}, upsert=True) for record in records],
+        ordered=False,
+        session=session
+    )
+
+async def apply_points(user_id: str, points: int, description: str, created_by: str = None,
+                       transaction_type: str = None, reference_id: str = None) -> Optional[dict]:
+    """Apply points to one user and record the transaction
+
+    Returns the updated {total_points, available_points, loyalty_tier}, or
+    None if the user doesn't exist.
+    """
+    users = await get_collection("users")
+    record = transaction_record(user_id, points, description, created_by, transaction_type, reference_id)
+
+    async def apply(session=None):
+        user = await users.find_one_and_update(
+            {"id": user_id},
+            points_update(points),
+            projection={"_id": 0, "total_points": 1, "available_points": 1, "loyalty_tier": 1},
+            return_document=ReturnDocument.AFTER,
+            session=session
+        )
+        if user:
+            await _record_transactions([record], session)
+        return user
+
+    if await transactions_supported():
+        async with await db.client.start_session() as session:
+            async with session.start_transaction():
+                return await apply(session)
+    return await apply()
+
+async def apply_points_bulk(awards: list, description: str, created_by: str = None,
+                            transaction_type: str = None, reference_id: str = None) -> dict:
+    """Apply points to many users, `awards` being a list of (user_id, points)
+
+    Users are updated with one bulk write per chunk of BULK_CHUNK_SIZE awards.
+    Returns {"awarded": count, "missing": [user ids that don't exist]}.
+    """
+    users = await get_collection("users")
+    user_ids = list({user_id for user_id, _ in awards})
+    existing = set()
+    for start in range(0, len(user_ids), BULK_CHUNK_SIZE):
+        async for user in users.find({"id": {"$in": user_ids[start:start + BULK_CHUNK_SIZE]}}, {"_id": 0, "id": 1}):
+            existing.add(user["id"])
+
+    valid_awards = [(user_id, points) for user_id, points in awards if user_id in existing]
+
+    async def apply(chunk: list, session=None):
+        await users.bulk_write(
+            [UpdateOne({"id": user_id}, points_update(points)) for user_id, points in chunk],
+            ordered=False,
+            session=session
+        )
+        await _record_transactions([
+            transaction_record(user_id, points, description, created_by, transaction_type, reference_id)
+            for user_id, points in chunk
+        ], session)
+
+    use_transactions = await transactions_supported()
+    for start in range(0, len(valid_awards), BULK_CHUNK_SIZE):
+        chunk = valid_awards[start:start + BULK_CHUNK_SIZE]
+        if use_transactions:
+            async with await db.client.start_session() as session:
+                async with session.start_transaction():
+                    await apply(chunk, session)
+        else:
+            await apply(chunk)
+
+    return {
+        "awarded": len(valid_awards),
+        "missing": sorted({user_id for user_id, _ in awards} - existing)
+    }
@@ -0,0 +1,78 @@
+"""
+Streaming storage of uploaded media.
+
+Uploads are copied chunk by chunk to a temporary file next to their
+destination while their size is counted and their SHA-256 computed, so
+memory stays bounded by the chunk size and an oversized file is abandoned as
+soon as it crosses the limit. `StagedFile.commit` then moves the temporary
+file into place with `os.replace` (atomic on a single filesystem): a file
+under UPLOAD_DIR is always complete.
+"""
+import hashlib
+import os
+import uuid
+from pathlib import Path
+
+import aiofiles
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+TEMP_DIRNAME = ".incoming"
+
+class FileTooLargeError(ValueError):
+    """Raised when an upload exceeds the size limit"""
+
+class StagedFile:
+    """Fully written upload waiting in the temporary directory"""
+
+    def __init__(self, path: Path, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+    def commit(self, destination: Path) -> Path:
+        os.replace(self.path, destination)
+        self.path = destination
+        return destination
+
+    def discard(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+async def iter_upload(file, chunk_size: int = CHUNK_SIZE):
+    """Chunks of an UploadFile"""
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+async def iter_bytes(data: bytes, chunk_size: int = CHUNK_SIZE):
+    """Chunks of an in-memory payload (views, no copies)"""
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+async def stage_upload(chunks, directory: Path, max_size: int) -> StagedFile:
+    """Write chunks to a temporary file under `directory`
+
+    Raises FileTooLargeError (and removes the partial file) as soon as more
+    than `max_size` bytes have been received.
+    """
+    temp_dir = directory / TEMP_DIRNAME
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = temp_dir / f"{uuid.uuid4().hex}.part"
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise FileTooLargeError(f"File exceeds {max_size} bytes")
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        StagedFile(temp_path, size, "").discard()
+        raise
+
+    return StagedFile(temp_path, size, digest.hexdigest())
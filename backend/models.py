@@ -36,6 +36,19 @@ class Article(ArticleBase):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+class ArticleSummary(BaseModel):
+    """Article without its content, for list views"""
+    id: str
+    title: str
+    category: str
+    excerpt: str
+    image: str
+    author: str
+    readTime: str
+    tags: List[str]
+    isPinned: bool = False
+    date: datetime
+
 # Contact Models
 class ContactCreate(BaseModel):
     nom: str
@@ -119,6 +132,13 @@ class ArticleListResponse(BaseModel):
     articles: List[Article]
     total: int
     hasMore: bool
+    nextCursor: Optional[str] = None
+
+class ArticleSummaryListResponse(BaseModel):
+    articles: List[ArticleSummary]
+    total: int
+    hasMore: bool
+    nextCursor: Optional[str] = None
 
 class ApiResponse(BaseModel):
     success: bool
@@ -217,6 +237,16 @@ class PointTransactionCreate(BaseModel):
     description: str
     reference_id: Optional[str] = None
 
+class PointsAward(BaseModel):
+    user_id: str
+    points: int
+
+class BulkPointsAward(BaseModel):
+    awards: List[PointsAward]
+    description: str
+    transaction_type: Optional[str] = None
+    reference_id: Optional[str] = None
+
 # User Extended Model
 class UserExtended(BaseModel):
     id: str
@@ -301,14 +331,38 @@ class SupportTicket(BaseModel):
     priority: str = "normal"  # low, normal, high, urgent
     status: str = "open"  # open, in_progress, waiting_response, resolved, closed
     
-    # Messages in the ticket
-    messages: List[dict] = []  # [{user_id, message, timestamp, is_admin}]
+    # Messages in the ticket (append-only, see tickets.py)
+    messages: List[dict] = []  # [{id, user_id, user_name, message, timestamp, is_admin}]
+    message_count: int = 0
+    last_message: Optional[dict] = None
     
     assigned_to: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     resolved_at: Optional[datetime] = None
 
+class SupportTicketSummary(BaseModel):
+    """Support ticket without its messages, for list views"""
+    id: str
+    user_id: str
+    title: str
+    description: str
+    category: str
+    priority: str = "normal"
+    status: str = "open"
+    message_count: int = 0
+    last_message: Optional[dict] = None
+    has_unread: bool = False
+    assigned_to: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    resolved_at: Optional[datetime] = None
+
+class TicketMessagesResponse(BaseModel):
+    messages: List[dict]
+    total: int
+    nextCursor: Optional[str] = None
+
 class SupportTicketCreate(BaseModel):
     title: str
     description: str
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Notification retention.
+
+Each notification stores a datetime `createdAt` and an `expiresAt` computed
+from its type; a TTL index on `expiresAt` lets MongoDB delete expired
+notifications in the background, so their volume stays bounded without admin
+action. `purge_notifications` removes old notifications on demand with a
+single `delete_many`. Retention is configured in days, per type:
+
+    NOTIFICATION_RETENTION_DAYS=30                  # default
+    NOTIFICATION_RETENTION_SECURITY_ALERT_DAYS=180  # override for one type
+
+Run this module to convert legacy notifications (ISO string `createdAt`, no
+`expiresAt`) and purge the expired ones. Those strings were written with
+`datetime.now()`, in the server's local time: they are read in
+NOTIFICATION_LEGACY_TIMEZONE (an Olson name such as Europe/Paris, or a UTC
+offset), by default the current UTC offset of the server:
+
+    python notification_retention.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from database import get_collection
+
+DEFAULT_RETENTION_DAYS = 30
+
+# Types kept longer than the default (audit trail)
+TYPE_RETENTION_DAYS = {
+    "SECURITY_ALERT": 180,
+    "SYSTEM_UPDATE": 90,
+}
+
+def retention_days(notification_type: str = None) -> int:
+    """Retention of a notification type, read lazily (.env is loaded after import)"""
+    if notification_type:
+        configured = os.environ.get(f"NOTIFICATION_RETENTION_{notification_type}_DAYS")
+        if configured:
+            return int(configured)
+        if notification_type in TYPE_RETENTION_DAYS:
+            return TYPE_RETENTION_DAYS[notification_type]
+    return int(os.environ.get("NOTIFICATION_RETENTION_DAYS", DEFAULT_RETENTION_DAYS))
+
+def retention_fields(notification_type: str, created_at: datetime = None) -> dict:
+    """createdAt / expiresAt of a new notification"""
+    created_at = created_at or datetime.utcnow()
+    return {
+        "createdAt": created_at,
+        "expiresAt": created_at + timedelta(days=retention_days(notification_type)),
+    }
+
+def purge_filter(types: list, days: int = None, now: datetime = None) -> dict:
+    """Notifications older than `days`, or than their type's retention"""
+    now = now or datetime.utcnow()
+    if days is not None:
+        return {"createdAt": {"$lt": now - timedelta(days=days)}}
+
+    overridden = [t for t in types if retention_days(t) != retention_days()]
+    return {"$or": [
+        *({"type": t, "createdAt": {"$lt": now - timedelta(days=retention_days(t))}} for t in overridden),
+        {"type": {"$nin": overridden}, "createdAt": {"$lt": now - timedelta(days=retention_days())}},
+    ]}
+
+async def purge_notifications(types: list, days: int = None) -> int:
+    """Delete old notifications in one round trip, returns the deleted count"""
+    collection = await get_collection("notifications")
+    result = await collection.delete_many(purge_filter(types, days))
+    return result.deleted_count
+
+def legacy_timezone() -> str:
+    """Timezone of the legacy local-time createdAt strings, read lazily"""
+    configured = os.environ.get("NOTIFICATION_LEGACY_TIMEZONE")
+    if configured:
+        return configured
+    offset = datetime.now().astimezone().strftime("%z")
+    return f"{offset[:3]}:{offset[3:5]}"
+
+async def backfill_notification_dates(types: list) -> int:
+    """Convert ISO string createdAt to dates and set expiresAt where missing"""
+    collection = await get_collection("notifications")
+    created_at = {"$cond": [
+        {"$eq": [{"$type": "$createdAt"}, "string"]},
+        # datetime.now().isoformat() strings: parse up to the seconds, in local time
+        {"$dateFromString": {
+            "dateString": {"$substrBytes": ["$createdAt", 0, 19]},
+            "timezone": legacy_timezone(),
+            "onError": "$$NOW"
+        }},
+        {"$ifNull": ["$createdAt", "$$NOW"]},
+    ]}
+    retention = {"$switch": {
+        "branches": [{"case": {"$eq": ["$type", t]}, "then": retention_days(t)} for t in types],
+        "default": retention_days(),
+    }}
+
+    result = await collection.update_many(
+        {"$or": [{"createdAt": {"$type": "string"}}, {"expiresAt": {"$exists": False}}]},
+        [
+            {"$set": {"createdAt": created_at}},
+            {"$set": {"expiresAt": {"$dateAdd": {
+                "startDate": "$createdAt", "unit": "day", "amount": retention
+            }}}},
+        ]
+    )
+    return result.modified_count
+
+async def main():
+    from database import connect_to_mongo, close_mongo_connection
+    from routers.notifications import NOTIFICATION_TYPES
+
+    try:
+        print("🔗 Connecting to MongoDB...")
+        await connect_to_mongo()
+        print("🔔 Converting legacy notifications...")
+        updated = await backfill_notification_dates(list(NOTIFICATION_TYPES))
+        print(f"✅ {updated} notifications updated")
+        deleted = await purge_notifications(list(NOTIFICATION_TYPES))
+        print(f"🧹 {deleted} expired notifications deleted")
+    except Exception as e:
+        print(f"❌ Error applying notification retention: {str(e)}")
+    finally:
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Password hashing off the event loop.
+
+bcrypt costs 100-300 ms of CPU per call. Hashes and verifications run on a
+bounded thread pool (bcrypt releases the GIL while hashing) behind a
+semaphore, so a burst of logins queues here instead of freezing every other
+request. Queue depth and wait times are exposed through `stats()`.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+class PasswordHasher:
+    """Run bcrypt on a bounded pool with a concurrency limit"""
+
+    def __init__(self, max_workers: int = None):
+        self._max_workers = max_workers
+        self._executor = None
+        self._semaphore = None
+        self.waiting = 0
+        self.running = 0
+        self.peak_waiting = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def max_workers(self) -> int:
+        # Read lazily: the .env file is loaded after the modules are imported
+        return self._max_workers or int(os.environ.get("PASSWORD_HASH_WORKERS", str(DEFAULT_WORKERS)))
+
+    def _pool(self):
+        if self._executor is None:
+            workers = self.max_workers
+            self._executor = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt")
+            self._semaphore = asyncio.Semaphore(workers)
+        return self._executor, self._semaphore
+
+    async def _run(self, function, *args):
+        executor, semaphore = self._pool()
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - queued_at
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queueDepth": self.waiting,
+            "peakQueueDepth": self.peak_waiting,
+            "completed": self.completed,
+            "avgWaitMs": round(self.total_wait / self.completed * 1000, 1) if self.completed else 0.0,
+            "maxWaitMs": round(self.max_wait * 1000, 1)
+        }
+
+password_hasher = PasswordHasher()
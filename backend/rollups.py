@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Daily rollup counters for analytics time series.
+
+One small document per day in `daily_rollups` holds the number of documents
+created that day in each tracked collection. Counters are incremented by
+`database.create_document`; run this module to rebuild them from history:
+
+    python rollups.py
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from pymongo import UpdateOne
+
+from database import get_collection, aggregate_documents
+
+ROLLUP_COLLECTION = "daily_rollups"
+DAY_FORMAT = "%Y-%m-%d"
+
+# Tracked collection -> counter name in the rollup documents
+ROLLUP_COUNTERS = {
+    "users": "registrations",
+    "contacts": "contacts",
+    "quote_requests": "quotes",
+    "support_tickets": "tickets",
+    "articles": "articles",
+}
+
+def day_key(date: datetime) -> str:
+    return date.strftime(DAY_FORMAT)
+
+async def record_creation(collection_name: str, created_at: datetime = None):
+    """Increment the counter of the day for a newly created document"""
+    counter = ROLLUP_COUNTERS.get(collection_name)
+    if not counter:
+        return
+
+    collection = await get_collection(ROLLUP_COLLECTION)
+    await collection.update_one(
+        {"day": day_key(created_at or datetime.utcnow())},
+        {"$inc": {counter: 1}},
+        upsert=True
+    )
+
+async def get_daily_rollups(days: int, end_date: datetime = None):
+    """Return the rollup rows of the last `days` days, keyed by day"""
+    end_date = end_date or datetime.utcnow()
+    start_key = day_key(end_date - timedelta(days=days - 1))
+
+    collection = await get_collection(ROLLUP_COLLECTION)
+    cursor = collection.find({"day": {"$gte": start_key, "$lte": day_key(end_date)}}, {"_id": 0})
+    rows = await cursor.to_list(length=days)
+    return {row["day"]: row for row in rows}
+
+async def backfill_rollups():
+    """Rebuild every counter from the creation dates stored in the collections
+
+    Each day row is overwritten in place with `$set` (upserted if missing), so
+    readers never see an emptied collection while the rebuild runs. Rows of
+    past days with no document left are removed; the current day is only
+    updated, a concurrent `record_creation` may have just created it.
+    """
+    started_at = datetime.utcnow()
+    totals = {}
+    for collection_name, counter in ROLLUP_COUNTERS.items():
+        rows = await aggregate_documents(collection_name, [
+            {"$match": {"created_at": {"$type": "date"}}},
+            {"$group": {
+                "_id": {"$dateToString": {"format": DAY_FORMAT, "date": "$created_at"}},
+                "count": {"$sum": 1}
+            }}
+        ])
+        for row in rows:
+            totals.setdefault(row["_id"], {})[counter] = row["count"]
+
+    collection = await get_collection(ROLLUP_COLLECTION)
+    if totals:
+        await collection.bulk_write([
+            UpdateOne(
+                {"day": day},
+                {"$set": {counter: counters.get(counter, 0) for counter in ROLLUP_COUNTERS.values()}},
+                upsert=True
+            )
+            for day, counters in sorted(totals.items())
+        ], ordered=False)
+    await collection.delete_many({"day": {"$nin": list(totals), "$lt": day_key(started_at)}})
+    return len(totals)
+
+async def main():
+    from database import connect_to_mongo, close_mongo_connection
+
+    try:
+        print("🔗 Connecting to MongoDB...")
+        await connect_to_mongo()
+        print("📊 Rebuilding daily rollups...")
+        days = await backfill_rollups()
+        print(f"✅ {days} daily rollup rows rebuilt")
+    except Exception as e:
+        print(f"❌ Error rebuilding rollups: {str(e)}")
+    finally:
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main())
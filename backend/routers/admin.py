@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 from datetime import datetime
+import asyncio
 import sys
 from pathlib import Path
 
@@ -10,12 +11,12 @@ from pydantic import BaseModel
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from auth import get_current_admin, User
+from auth import get_current_admin, User, invalidate_principal, invalidate_all_principals, principal_cache
 from models import (
     Article, ArticleCreate, ArticleUpdate, ArticleListResponse,
     Contact, Service, ServiceCreate, Testimonial, TestimonialCreate,
     Competence, CompetenceCreate, FAQ, FAQCreate, ApiResponse,
-    QuoteRequestUpdate
+    QuoteRequestUpdate, BulkPointsAward, TicketMessagesResponse
 )
 
 # Pydantic model for ticket message
@@ -23,8 +24,19 @@ class TicketMessageCreate(BaseModel):
     message: str
 from database import (
     get_documents, get_document, create_document, 
-    update_document, delete_document, search_documents
+    update_document, delete_document, search_documents,
+    count_by_field, join_documents, InvalidCursorError
 )
+from search import search_articles
+from cache import cached, invalidate, cache_stats
+from ledger import apply_points_bulk
+from analytics_engine import get_client_stats, get_admin_dashboard_stats
+from tickets import (
+    SUMMARY_PROJECTION, new_message, append_message, ticket_summary, get_messages_page
+)
+from passwords import password_hasher
+from image_processing import image_processor
+from image_resizing import resize_cache
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -33,52 +45,24 @@ router = APIRouter(prefix="/api/admin", tags=["admin"])
 async def get_dashboard_stats(current_admin: User = Depends(get_current_admin)):
     """Get dashboard statistics for admin panel"""
     try:
-        # Get counts for different entities
-        articles, articles_count = await get_documents("articles", {}, limit=1)
-        contacts, contacts_count = await get_documents("contacts", {}, limit=1)
-        services, services_count = await get_documents("services", {"active": True}, limit=1)
-        users, users_count = await get_documents("users", {}, limit=1)
-        
-        # Get recent contacts
-        recent_contacts, _ = await get_documents(
-            "contacts", {}, limit=5, sort_field="created_at", sort_direction=-1
-        )
-        
-        # Get recent articles
-        recent_articles, _ = await get_documents(
-            "articles", {}, limit=5, sort_field="created_at", sort_direction=-1
-        )
-        
-        return {
-            "totals": {
-                "articles": articles_count,
-                "contacts": contacts_count,
-                "services": services_count,
-                "users": users_count
-            },
-            "recent_contacts": [
-                {
-                    "id": contact.get("id"),
-                    "nom": contact.get("nom"),
-                    "email": contact.get("email"),
-                    "sujet": contact.get("sujet"),
-                    "created_at": contact.get("created_at")
-                } for contact in recent_contacts
-            ],
-            "recent_articles": [
-                {
-                    "id": article.get("id"),
-                    "title": article.get("title"),
-                    "category": article.get("category"),
-                    "author": article.get("author"),
-                    "created_at": article.get("created_at")
-                } for article in recent_articles
-            ]
-        }
+        # Shared by the admins polling the dashboard, refreshed every few seconds
+        return await cached("dashboard:stats", get_admin_dashboard_stats)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching dashboard stats: {str(e)}")
 
+# System metrics
+@router.get("/system/metrics")
+async def get_system_metrics(current_admin: User = Depends(get_current_admin)):
+    """Get in-process cache, principal cache, password hashing and image metrics (admin only)"""
+    return {
+        "cache": cache_stats(),
+        "principals": principal_cache.stats(),
+        "passwordHashing": password_hasher.stats(),
+        "imageProcessing": image_processor.stats(),
+        "resizedImages": resize_cache.stats()
+    }
+
 # Article Management
 @router.get("/articles", response_model=ArticleListResponse)
 async def admin_get_articles(
@@ -96,9 +80,8 @@ async def admin_get_articles(
             filter_dict["category"] = category
         
         if search:
-            articles, total = await search_documents(
-                "articles", search, ["title", "excerpt", "content"], 
-                skip=offset, limit=limit
+            articles, _, total = await search_articles(
+                search, filter_dict, skip=offset, limit=limit
             )
         else:
             articles, total = await get_documents(
@@ -131,6 +114,7 @@ async def admin_create_article(
         article_obj = Article(**article_dict)
         
         await create_document("articles", article_obj.dict())
+        await invalidate("news")
         
         return ApiResponse(
             success=True,
@@ -163,6 +147,8 @@ async def admin_update_article(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update article")
         
+        await invalidate("news")
+        
         return ApiResponse(
             success=True,
             message="Article mis à jour avec succès"
@@ -189,6 +175,8 @@ async def admin_delete_article(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete article")
         
+        await invalidate("news")
+        
         return ApiResponse(
             success=True,
             message="Article supprimé avec succès"
@@ -228,7 +216,7 @@ async def admin_get_contacts(
 async def admin_get_services(current_admin: User = Depends(get_current_admin)):
     """Get all services including inactive ones (admin only)"""
     try:
-        services, _ = await get_documents("services", {}, limit=100)
+        services, _ = await get_documents("services", {}, limit=100, count="none")
         
         service_objects = []
         for service in services:
@@ -249,6 +237,7 @@ async def admin_create_service(
     try:
         service_obj = Service(**service.dict())
         await create_document("services", service_obj.dict())
+        await invalidate("services")
         
         return ApiResponse(
             success=True,
@@ -264,7 +253,7 @@ async def admin_create_service(
 async def admin_get_testimonials(current_admin: User = Depends(get_current_admin)):
     """Get all testimonials including inactive ones (admin only)"""
     try:
-        testimonials, _ = await get_documents("testimonials", {}, limit=100)
+        testimonials, _ = await get_documents("testimonials", {}, limit=100, count="none")
         
         testimonial_objects = []
         for testimonial in testimonials:
@@ -285,6 +274,7 @@ async def admin_create_testimonial(
     try:
         testimonial_obj = Testimonial(**testimonial.dict())
         await create_document("testimonials", testimonial_obj.dict())
+        await invalidate("testimonials")
         
         return ApiResponse(
             success=True,
@@ -327,24 +317,20 @@ async def admin_get_clients(
                 sort_field="created_at", sort_direction=-1
             )
         
-        # Enrich with additional stats
+        # Enrich with additional stats (one aggregation per collection for the page)
+        user_ids = [user["id"] for user in users]
+        quotes_counts, tickets_counts = await asyncio.gather(
+            count_by_field("quote_requests", "user_id", user_ids),
+            count_by_field("support_tickets", "user_id", user_ids)
+        )
+        
         client_list = []
         for user in users:
             user.pop('_id', None)
             user.pop('hashed_password', None)
             
-            # Get quotes count
-            quotes, quotes_count = await get_documents(
-                "quote_requests", {"user_id": user["id"]}, limit=1
-            )
-            
-            # Get tickets count
-            tickets, tickets_count = await get_documents(
-                "support_tickets", {"user_id": user["id"]}, limit=1
-            )
-            
-            user["quotes_count"] = quotes_count
-            user["tickets_count"] = tickets_count
+            user["quotes_count"] = quotes_counts.get(user["id"], 0)
+            user["tickets_count"] = tickets_counts.get(user["id"], 0)
             client_list.append(user)
         
         return client_list
@@ -382,6 +368,31 @@ async def admin_add_client_points(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding points: {str(e)}")
 
+@router.post("/clients/points/bulk", response_model=ApiResponse)
+async def admin_bulk_add_points(
+    bulk_award: BulkPointsAward,
+    current_admin: User = Depends(get_current_admin)
+):
+    """Add points to many clients in one call (admin only)"""
+    try:
+        result = await apply_points_bulk(
+            [(award.user_id, award.points) for award in bulk_award.awards],
+            bulk_award.description,
+            created_by=current_admin.id,
+            transaction_type=bulk_award.transaction_type,
+            reference_id=bulk_award.reference_id
+        )
+        await invalidate_all_principals()
+        
+        return ApiResponse(
+            success=True,
+            message=f"Points attribués à {result['awarded']} client(s)",
+            data=result
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error adding points: {str(e)}")
+
 @router.get("/quotes", response_model=List[dict])
 async def admin_get_quotes(
     status: Optional[str] = Query(None),
@@ -401,20 +412,16 @@ async def admin_get_quotes(
             sort_field="created_at", sort_direction=-1
         )
         
-        # Enrich with user info
-        quote_list = []
         for quote in quotes:
             quote.pop('_id', None)
-            
-            # Get user info
-            user = await get_document("users", quote["user_id"])
-            if user:
-                quote["client_name"] = user["full_name"]
-                quote["client_email"] = user["email"]
-            
-            quote_list.append(quote)
         
-        return quote_list
+        # Enrich with user info (one query for the whole page)
+        await join_documents(
+            quotes, "user_id", "users",
+            {"client_name": "full_name", "client_email": "email"}
+        )
+        
+        return quotes
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching quotes: {str(e)}")
@@ -470,29 +477,50 @@ async def admin_get_tickets(
         if priority and priority != "all":
             filter_dict["priority"] = priority
         
-        tickets, total = await get_documents(
+        # Summaries only: the threads are loaded page by page on demand
+        tickets, _ = await get_documents(
             "support_tickets", filter_dict, skip=offset, limit=limit,
-            sort_field="created_at", sort_direction=-1
+            sort_field="created_at", sort_direction=-1,
+            count="none", projection=SUMMARY_PROJECTION
         )
         
-        # Enrich with user info
-        ticket_list = []
         for ticket in tickets:
-            ticket.pop('_id', None)
-            
-            # Get user info
-            user = await get_document("users", ticket["user_id"])
-            if user:
-                ticket["client_name"] = user["full_name"]
-                ticket["client_email"] = user["email"]
-            
-            ticket_list.append(ticket)
+            ticket_summary(ticket, viewer_is_admin=True)
         
-        return ticket_list
+        # Enrich with user info (one query for the whole page)
+        await join_documents(
+            tickets, "user_id", "users",
+            {"client_name": "full_name", "client_email": "email"}
+        )
+        
+        return tickets
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tickets: {str(e)}")
 
+@router.get("/tickets/{ticket_id}/messages", response_model=TicketMessagesResponse)
+async def admin_get_ticket_messages(
+    ticket_id: str,
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Get a page of a support ticket thread (admin view)"""
+    try:
+        page = await get_messages_page(ticket_id, viewer_is_admin=True, cursor=cursor, limit=limit)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        
+        messages, next_cursor, total = page
+        return TicketMessagesResponse(messages=messages, total=total, nextCursor=next_cursor)
+        
+    except HTTPException:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching messages: {str(e)}")
+
 @router.post("/tickets/{ticket_id}/messages", response_model=ApiResponse)
 async def admin_add_ticket_message(
     ticket_id: str,
@@ -501,28 +529,15 @@ async def admin_add_ticket_message(
 ):
     """Add admin message to support ticket"""
     try:
-        ticket = await get_document("support_tickets", ticket_id)
+        # Append only the new message (atomic, concurrent replies are all kept)
+        added = await append_message(
+            ticket_id,
+            new_message(current_admin.id, current_admin.full_name, message_data.message, is_admin=True)
+        )
         
-        if not ticket:
+        if not added:
             raise HTTPException(status_code=404, detail="Ticket not found")
         
-        # Add admin message to ticket
-        new_message = {
-            "user_id": current_admin.id,
-            "user_name": current_admin.full_name,
-            "message": message_data.message,
-            "timestamp": datetime.utcnow(),
-            "is_admin": True
-        }
-        
-        messages = ticket.get("messages", [])
-        messages.append(new_message)
-        
-        await update_document("support_tickets", ticket_id, {
-            "messages": messages,
-            "updated_at": datetime.utcnow()
-        })
-        
         return ApiResponse(
             success=True,
             message="Réponse ajoutée avec succès"
@@ -537,50 +552,11 @@ async def admin_add_ticket_message(
 async def admin_get_client_stats(current_admin: User = Depends(get_current_admin)):
     """Get client statistics for admin dashboard"""
     try:
-        # Total clients
-        all_clients, total_clients = await get_documents(
-            "users", {"role": {"$regex": "^client|^prospect"}}, limit=1
-        )
-        
-        # New clients this month
-        from datetime import datetime, timedelta
-        month_ago = datetime.utcnow() - timedelta(days=30)
-        new_clients, new_count = await get_documents(
-            "users", {
-                "role": {"$regex": "^client|^prospect"},
-                "created_at": {"$gte": month_ago}
-            }, limit=1
-        )
-        
-        # Active clients (with recent activity)
-        active_clients, active_count = await get_documents(
-            "users", {
-                "role": {"$regex": "^client|^prospect"},
-                "is_active": True
-            }, limit=1
-        )
-        
-        # Total points distributed
-        transactions, _ = await get_documents("point_transactions", {}, limit=1000)
-        total_points = sum(t.get("points", 0) for t in transactions if t.get("points", 0) > 0)
-        
-        # Pending quotes
-        pending_quotes, pending_count = await get_documents(
-            "quote_requests", {"status": "pending"}, limit=1
-        )
-        
-        # Open tickets
-        open_tickets, tickets_count = await get_documents(
-            "support_tickets", {"status": {"$nin": ["resolved", "closed"]}}, limit=1
-        )
+        # Exact totals over any number of transactions, in one aggregation
+        stats = await get_client_stats()
         
         return {
-            "total_clients": total_clients,
-            "new_clients_this_month": new_count,
-            "active_clients": active_count,
-            "total_points_distributed": total_points,
-            "pending_quotes": pending_count,
-            "open_tickets": tickets_count,
+            **stats,
             "revenue_this_month": 0.0  # To be implemented with actual revenue tracking
         }
         
@@ -627,6 +603,13 @@ async def admin_get_users(
                 sort_field="created_at", sort_direction=-1
             )
         
+        # Quote and ticket counts for every client of the page in one aggregation each
+        client_ids = [user["id"] for user in users if user.get('role', '').startswith('client')]
+        quotes_counts, tickets_counts = await asyncio.gather(
+            count_by_field("quote_requests", "user_id", client_ids),
+            count_by_field("support_tickets", "user_id", client_ids)
+        )
+        
         # Process users to remove sensitive data and add stats
         user_list = []
         for user in users:
@@ -635,13 +618,8 @@ async def admin_get_users(
             
             # For clients, add additional stats
             if user.get('role', '').startswith('client'):
-                # Get quotes count
-                quotes, quotes_count = await get_documents("quotes", {"user_id": user["id"]}, limit=1)
-                user["quotes_count"] = quotes_count
-                
-                # Get tickets count
-                tickets, tickets_count = await get_documents("tickets", {"user_id": user["id"]}, limit=1)
-                user["tickets_count"] = tickets_count
+                user["quotes_count"] = quotes_counts.get(user["id"], 0)
+                user["tickets_count"] = tickets_counts.get(user["id"], 0)
                 
                 # Ensure points fields exist
                 user["total_points"] = user.get("total_points", 0)
@@ -758,6 +736,7 @@ async def admin_update_user(
         
         if update_data:
             await update_document("users", user_id, update_data)
+            await invalidate_principal(user_id)
         
         return {
             "success": True,
@@ -787,6 +766,7 @@ async def admin_delete_user(
         
         # Delete user
         await delete_document("users", user_id)
+        await invalidate_principal(user_id)
         
         return {
             "success": True,
@@ -817,6 +797,7 @@ async def admin_update_user_status(
         
         # Update status
         await update_document("users", user_id, {"is_active": status_data.is_active})
+        await invalidate_principal(user_id)
         
         return {
             "success": True,
@@ -4,15 +4,17 @@ import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import random
-from collections import defaultdict
+import asyncio
 
 # Add backend directory to path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from models import ApiResponse
-from database import get_documents
+from database import get_documents, count_documents
 from auth import get_current_admin
+from analytics_engine import get_overview_metrics
+from rollups import get_daily_rollups
 
 router = APIRouter(prefix="/api/admin/analytics", tags=["analytics"])
 
@@ -23,69 +25,24 @@ async def get_analytics_overview(
 ):
     """Get analytics overview with real growth metrics from database"""
     try:
-        # Calculate date range
         days = int(time_range[:-1])
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
         
-        # Get real data from database
-        users, total_users = await get_documents("users", {}, limit=10000)
-        articles, total_articles = await get_documents("articles", {}, limit=10000)
-        contacts, total_contacts = await get_documents("contacts", {}, limit=10000)
-        quotes, total_quotes = await get_documents("quotes", {}, limit=10000)
-        
-        # Calculate real growth based on creation dates within time range
-        def calculate_growth(documents, date_field="created_at"):
-            current_period = 0
-            previous_period = 0
-            
-            for doc in documents:
-                doc_date_str = doc.get(date_field) or doc.get("date") or doc.get("createdAt")
-                if doc_date_str:
-                    try:
-                        if isinstance(doc_date_str, str):
-                            # Try multiple date formats
-                            for fmt in ["%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d"]:
-                                try:
-                                    doc_date = datetime.strptime(doc_date_str, fmt)
-                                    break
-                                except ValueError:
-                                    continue
-                            else:
-                                doc_date = datetime.fromisoformat(doc_date_str.replace('Z', '+00:00'))
-                        else:
-                            doc_date = doc_date_str
-                        
-                        if doc_date >= start_date:
-                            current_period += 1
-                        elif doc_date >= start_date - timedelta(days=days):
-                            previous_period += 1
-                    except:
-                        continue
-            
-            if previous_period == 0:
-                return 100.0 if current_period > 0 else 0.0
-            return round(((current_period - previous_period) / previous_period) * 100, 1)
-        
-        # Calculate real growth rates
-        growth_users = calculate_growth(users)
-        growth_articles = calculate_growth(articles, "date")
-        growth_contacts = calculate_growth(contacts)
-        growth_quotes = calculate_growth(quotes)
+        # Counts and growth are aggregated server-side
+        metrics = await get_overview_metrics(days)
         
         return {
             "success": True,
             "data": {
                 "overview": {
-                    "totalUsers": total_users,
-                    "totalArticles": total_articles,
-                    "totalContacts": total_contacts,
-                    "totalQuotes": total_quotes,
+                    "totalUsers": metrics["users"]["total"],
+                    "totalArticles": metrics["articles"]["total"],
+                    "totalContacts": metrics["contacts"]["total"],
+                    "totalQuotes": metrics["quotes"]["total"],
                     "growth": {
-                        "users": growth_users,
-                        "articles": growth_articles,
-                        "contacts": growth_contacts,
-                        "quotes": growth_quotes
+                        "users": metrics["users"]["growth"],
+                        "articles": metrics["articles"]["growth"],
+                        "contacts": metrics["contacts"]["growth"],
+                        "quotes": metrics["quotes"]["growth"]
                     }
                 },
                 "timeRange": time_range
@@ -104,40 +61,21 @@ async def get_user_activity(
     try:
         days = int(time_range[:-1])
         
-        # Get all users to analyze their real activity
-        users, _ = await get_documents("users", {}, limit=10000)
-        
-        # Count real user registrations by date
-        daily_registrations = defaultdict(int)
-        for user in users:
-            created_date = user.get("created_at") or user.get("createdAt")
-            if created_date:
-                try:
-                    if isinstance(created_date, str):
-                        for fmt in ["%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d"]:
-                            try:
-                                date_obj = datetime.strptime(created_date, fmt)
-                                break
-                            except ValueError:
-                                continue
-                        else:
-                            date_obj = datetime.fromisoformat(created_date.replace('Z', '+00:00'))
-                    else:
-                        date_obj = created_date
-                    
-                    date_key = date_obj.strftime("%Y-%m-%d")
-                    daily_registrations[date_key] += 1
-                except:
-                    continue
+        # Daily counters are pre-aggregated in the rollup collection
+        rollups, total_users = await asyncio.gather(
+            get_daily_rollups(days),
+            count_documents("users", estimated=True)
+        )
         
         # Generate activity data for requested time range
         activity_data = []
         for i in range(days):
-            date = datetime.now() - timedelta(days=days-1-i)
+            date = datetime.utcnow() - timedelta(days=days-1-i)
             date_key = date.strftime("%Y-%m-%d")
             
             # Real user registrations for this date
-            new_users = daily_registrations.get(date_key, 0)
+            day_counters = rollups.get(date_key, {})
+            new_users = day_counters.get("registrations", 0)
             
             # Estimate active users (more recent registrations = higher activity)
             days_ago = i
@@ -149,14 +87,18 @@ async def get_user_activity(
                 active_multiplier = 0.3  # 30% of older users are active
             
             # Calculate realistic active users and sessions
-            estimated_active = max(1, int(len(users) * active_multiplier / days))
+            estimated_active = max(1, int(total_users * active_multiplier / days))
             estimated_sessions = max(estimated_active, int(estimated_active * 1.5))  # 1.5 sessions per active user
             
             activity_data.append({
                 "date": date.strftime("%Y-%m-%d"),
                 "users": estimated_active,
                 "sessions": estimated_sessions,
-                "newUsers": new_users
+                "newUsers": new_users,
+                "contacts": day_counters.get("contacts", 0),
+                "quotes": day_counters.get("quotes", 0),
+                "tickets": day_counters.get("tickets", 0),
+                "articles": day_counters.get("articles", 0)
             })
         
         return {
@@ -164,7 +106,7 @@ async def get_user_activity(
             "data": {
                 "userActivity": activity_data,
                 "timeRange": time_range,
-                "totalUsers": len(users)
+                "totalUsers": total_users
             }
         }
         
@@ -179,7 +121,7 @@ async def get_content_performance(
     """Get real content performance metrics from database"""
     try:
         # Get all articles from database
-        articles, _ = await get_documents("articles", {}, limit=limit, sort_field="date", sort_direction=-1)
+        articles, _ = await get_documents("articles", {}, limit=limit, sort_field="date", sort_direction=-1, count="none")
         
         performance_data = []
         for article in articles:
@@ -11,12 +11,16 @@ from auth import get_current_client, get_current_active_user, User, update_user_
 from models import (
     ClientProfile, ClientProfileCreate, ClientProfileUpdate,
     QuoteRequest, QuoteRequestCreate, QuoteRequestUpdate,
-    SupportTicket, SupportTicketCreate, TicketMessage,
+    SupportTicket, SupportTicketCreate, SupportTicketSummary, TicketMessage, TicketMessagesResponse,
     ClientDashboardStats, PointTransaction, ApiResponse
 )
 from database import (
     get_documents, get_document, create_document, 
-    update_document, delete_document, search_documents
+    update_document, delete_document, search_documents, InvalidCursorError
+)
+from analytics_engine import get_client_dashboard_counts
+from tickets import (
+    SUMMARY_PROJECTION, new_message, append_message, ticket_summary, get_messages_page
 )
 
 router = APIRouter(prefix="/api/client", tags=["client"])
@@ -47,7 +51,7 @@ async def get_client_profile(current_user: User = Depends(get_current_client)):
                 email_notifications=True
             )
         
-        profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1)
+        profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1, count="none")
         
         if profiles:
             profile_data = profiles[0]
@@ -73,7 +77,7 @@ async def create_client_profile(
     """Create or update client profile"""
     try:
         # Check if profile exists
-        existing_profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1)
+        existing_profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1, count="none")
         
         profile_data = profile.dict()
         profile_data["user_id"] = current_user.id
@@ -104,7 +108,7 @@ async def update_client_profile(
 ):
     """Update client profile"""
     try:
-        profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1)
+        profiles, _ = await get_documents("client_profiles", {"user_id": current_user.id}, limit=1, count="none")
         
         if not profiles:
             raise HTTPException(status_code=404, detail="Profile not found")
@@ -149,45 +153,9 @@ async def get_client_dashboard(current_user: User = Depends(get_current_client))
                 recent_transactions=[]
             )
         
-        # Get recent point transactions for regular clients
-        transactions, _ = await get_documents(
-            "point_transactions", 
-            {"user_id": current_user.id}, 
-            limit=10, 
-            sort_field="created_at", 
-            sort_direction=-1
-        )
-        
-        recent_transactions = []
-        for trans in transactions:
-            # Remove all MongoDB-specific fields that could contain ObjectId
-            clean_trans = {k: v for k, v in trans.items() if k not in ['_id', 'ObjectId']}
-            # Convert any remaining ObjectId to string (safety measure)
-            for key, value in clean_trans.items():
-                if hasattr(value, '__class__') and 'ObjectId' in str(value.__class__):
-                    clean_trans[key] = str(value)
-            recent_transactions.append(PointTransaction(**clean_trans))
-        
-        # Get active quotes count
-        active_quotes, active_count = await get_documents(
-            "quote_requests", 
-            {"user_id": current_user.id, "status": {"$nin": ["completed", "rejected"]}}, 
-            limit=1
-        )
-        
-        # Get completed projects count  
-        completed_quotes, completed_count = await get_documents(
-            "quote_requests", 
-            {"user_id": current_user.id, "status": "completed"}, 
-            limit=1
-        )
-        
-        # Get open tickets count
-        open_tickets, tickets_count = await get_documents(
-            "support_tickets", 
-            {"user_id": current_user.id, "status": {"$nin": ["resolved", "closed"]}}, 
-            limit=1
-        )
+        # Transactions, quote counters and open tickets in one concurrent fan-out
+        counts = await get_client_dashboard_counts(current_user.id)
+        recent_transactions = [PointTransaction(**trans) for trans in counts["recent_transactions"]]
         
         # Calculate next tier points
         from auth import get_next_tier_points
@@ -198,9 +166,9 @@ async def get_client_dashboard(current_user: User = Depends(get_current_client))
             available_points=current_user.available_points,
             loyalty_tier=current_user.loyalty_tier,
             next_tier_points=next_tier_points,
-            active_quotes=active_count,
-            completed_projects=completed_count,
-            open_tickets=tickets_count,
+            active_quotes=counts["active_quotes"],
+            completed_projects=counts["completed_projects"],
+            open_tickets=counts["open_tickets"],
             recent_transactions=recent_transactions
         )
         
@@ -306,7 +274,7 @@ async def create_support_ticket(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating ticket: {str(e)}")
 
-@router.get("/tickets", response_model=List[SupportTicket])
+@router.get("/tickets", response_model=List[SupportTicketSummary])
 async def get_client_tickets(
     status: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
@@ -320,21 +288,43 @@ async def get_client_tickets(
         if status and status != "all":
             filter_dict["status"] = status
         
-        tickets, total = await get_documents(
+        # Summaries only: the threads are loaded page by page on demand
+        tickets, _ = await get_documents(
             "support_tickets", filter_dict, skip=offset, limit=limit,
-            sort_field="created_at", sort_direction=-1
+            sort_field="created_at", sort_direction=-1,
+            count="none", projection=SUMMARY_PROJECTION
         )
         
-        ticket_objects = []
-        for ticket in tickets:
-            ticket.pop('_id', None)
-            ticket_objects.append(SupportTicket(**ticket))
-        
-        return ticket_objects
+        return [SupportTicketSummary(**ticket_summary(ticket, viewer_is_admin=False)) for ticket in tickets]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tickets: {str(e)}")
 
+@router.get("/tickets/{ticket_id}/messages", response_model=TicketMessagesResponse)
+async def get_ticket_messages(
+    ticket_id: str,
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_client)
+):
+    """Get a page of a support ticket thread (most recent messages first)"""
+    try:
+        page = await get_messages_page(
+            ticket_id, viewer_is_admin=False, cursor=cursor, limit=limit, user_id=current_user.id
+        )
+        if page is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        
+        messages, next_cursor, total = page
+        return TicketMessagesResponse(messages=messages, total=total, nextCursor=next_cursor)
+        
+    except HTTPException:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching messages: {str(e)}")
+
 @router.post("/tickets/{ticket_id}/messages", response_model=ApiResponse)
 async def add_ticket_message(
     ticket_id: str,
@@ -343,32 +333,19 @@ async def add_ticket_message(
 ):
     """Add a message to support ticket"""
     try:
-        ticket = await get_document("support_tickets", ticket_id)
-        
-        if not ticket:
-            raise HTTPException(status_code=404, detail="Ticket not found")
+        # Append only the new message (atomic, restricted to the ticket owner)
+        added = await append_message(
+            ticket_id,
+            new_message(current_user.id, current_user.full_name, message.message, is_admin=False),
+            user_id=current_user.id
+        )
         
-        # Check if user owns this ticket
-        if ticket.get("user_id") != current_user.id:
+        if not added:
+            ticket = await get_document("support_tickets", ticket_id, {"_id": 0, "user_id": 1})
+            if not ticket:
+                raise HTTPException(status_code=404, detail="Ticket not found")
             raise HTTPException(status_code=403, detail="Access denied")
         
-        # Add message to ticket
-        new_message = {
-            "user_id": current_user.id,
-            "user_name": current_user.full_name,
-            "message": message.message,
-            "timestamp": __import__('datetime').datetime.utcnow(),
-            "is_admin": False
-        }
-        
-        messages = ticket.get("messages", [])
-        messages.append(new_message)
-        
-        await update_document("support_tickets", ticket_id, {
-            "messages": messages,
-            "updated_at": __import__('datetime').datetime.utcnow()
-        })
-        
         return ApiResponse(
             success=True,
             message="Message ajouté avec succès"
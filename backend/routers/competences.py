@@ -8,6 +8,7 @@ sys.path.insert(0, str(backend_dir))
 
 from models import Competence, CompetenceCreate, ApiResponse
 from database import get_documents, get_document, create_document, update_document, delete_document
+from cache import cached, invalidate
 from typing import List
 
 router = APIRouter(prefix="/api/competences", tags=["competences"])
@@ -16,20 +17,24 @@ router = APIRouter(prefix="/api/competences", tags=["competences"])
 async def get_competences():
     """Get all competences"""
     try:
-        competences, _ = await get_documents(
-            "competences", 
-            {}, 
-            limit=100,
-            sort_field="category",
-            sort_direction=1
-        )
-        
-        competence_objects = []
-        for competence in competences:
-            competence.pop('_id', None)
-            competence_objects.append(Competence(**competence))
-        
-        return competence_objects
+        async def load_competences():
+            competences, _ = await get_documents(
+                "competences", 
+                {}, 
+                limit=100,
+                sort_field="category",
+                sort_direction=1,
+                count="none"
+            )
+            
+            competence_objects = []
+            for competence in competences:
+                competence.pop('_id', None)
+                competence_objects.append(Competence(**competence))
+            
+            return competence_objects
+        
+        return await cached("competences:list", load_competences)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching competences: {str(e)}")
@@ -38,17 +43,20 @@ async def get_competences():
 async def get_competences_by_category():
     """Get competences grouped by category"""
     try:
-        competences, _ = await get_documents("competences", {}, limit=100)
-        
-        grouped = {}
-        for comp in competences:
-            comp.pop('_id', None)
-            category = comp.get('category', 'Other')
-            if category not in grouped:
-                grouped[category] = []
-            grouped[category].append(Competence(**comp))
-        
-        return grouped
+        async def load_grouped():
+            competences, _ = await get_documents("competences", {}, limit=100, count="none")
+            
+            grouped = {}
+            for comp in competences:
+                comp.pop('_id', None)
+                category = comp.get('category', 'Other')
+                if category not in grouped:
+                    grouped[category] = []
+                grouped[category].append(Competence(**comp))
+            
+            return grouped
+        
+        return await cached("competences:by-category", load_grouped)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching competences: {str(e)}")
@@ -60,6 +68,7 @@ async def create_competence(competence: CompetenceCreate):
         competence_obj = Competence(**competence.dict())
         
         await create_document("competences", competence_obj.dict())
+        await invalidate("competences")
         
         return ApiResponse(
             success=True,
@@ -84,6 +93,8 @@ async def update_competence(competence_id: str, competence_update: CompetenceCre
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update competence")
         
+        await invalidate("competences")
+        
         return ApiResponse(
             success=True,
             message="Compétence mise à jour avec succès"
@@ -107,6 +118,8 @@ async def delete_competence(competence_id: str):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete competence")
         
+        await invalidate("competences")
+        
         return ApiResponse(
             success=True,
             message="Compétence supprimée avec succès"
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 import sys
 from pathlib import Path
 
@@ -8,28 +8,39 @@ sys.path.insert(0, str(backend_dir))
 
 from models import FAQ, FAQCreate, ApiResponse
 from database import get_documents, get_document, create_document, update_document, delete_document
+from cache import cached, invalidate
+from conditional import is_not_modified, list_validators, not_modified, set_validators
 from typing import List
 
 router = APIRouter(prefix="/api/faq", tags=["faq"])
 
 @router.get("/", response_model=List[FAQ])
-async def get_faqs():
+async def get_faqs(request: Request, response: Response):
     """Get all active FAQs"""
     try:
-        faqs, _ = await get_documents(
-            "faq", 
-            {"active": True}, 
-            limit=100,
-            sort_field="created_at",
-            sort_direction=1
-        )
+        etag, last_modified = await list_validators("faq", "faq", {"active": True})
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_validators(response, etag, last_modified)
         
-        faq_objects = []
-        for faq in faqs:
-            faq.pop('_id', None)
-            faq_objects.append(FAQ(**faq))
+        async def load_faqs():
+            faqs, _ = await get_documents(
+                "faq", 
+                {"active": True}, 
+                limit=100,
+                sort_field="created_at",
+                sort_direction=1,
+                count="none"
+            )
+            
+            faq_objects = []
+            for faq in faqs:
+                faq.pop('_id', None)
+                faq_objects.append(FAQ(**faq))
+            
+            return faq_objects
         
-        return faq_objects
+        return await cached("faq:list", load_faqs)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching FAQs: {str(e)}")
@@ -41,6 +52,7 @@ async def create_faq(faq: FAQCreate):
         faq_obj = FAQ(**faq.dict())
         
         await create_document("faq", faq_obj.dict())
+        await invalidate("faq")
         
         return ApiResponse(
             success=True,
@@ -65,6 +77,8 @@ async def update_faq(faq_id: str, faq_update: FAQCreate):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update FAQ")
         
+        await invalidate("faq")
+        
         return ApiResponse(
             success=True,
             message="FAQ mise à jour avec succès"
@@ -88,6 +102,8 @@ async def delete_faq(faq_id: str):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete FAQ")
         
+        await invalidate("faq")
+        
         return ApiResponse(
             success=True,
             message="FAQ supprimée avec succès"
@@ -1,25 +1,38 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request, Response
+from fastapi.responses import FileResponse
 from typing import List, Optional
+from pymongo import ReturnDocument
+import asyncio
 import sys
 from pathlib import Path
 import os
 import uuid
 import base64
 import mimetypes
+import re
+import shutil
+import time
 from datetime import datetime
-import aiofiles
-from PIL import Image
-import io
 
 # Add backend directory to path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from models import ApiResponse
-from database import get_documents, create_document, update_document, delete_document
+from database import (
+    get_collection, get_document, get_documents, count_documents, get_documents_page, create_document, update_document, delete_document,
+    aggregate_documents, InvalidCursorError
+)
 from auth import get_current_admin
+from media_storage import stage_upload, iter_upload, iter_bytes, FileTooLargeError
+from image_processing import (
+    image_processor, choose_variant, DEFAULT_THUMBNAIL, DERIVATIVE_FORMATS
+)
+from conditional import make_etag, is_not_modified
+from image_resizing import resize_cache
 
 router = APIRouter(prefix="/api/admin/media", tags=["media"])
+public_router = APIRouter(prefix="/api/media", tags=["media"])
 
 # Configuration
 UPLOAD_DIR = Path("uploads")
@@ -44,21 +57,146 @@ def get_file_type(content_type: str) -> str:
     else:
         return "other"
 
-def generate_thumbnail(file_path: Path, thumbnail_path: Path, size: tuple = (300, 300)):
-    """Générer une miniature pour les images"""
+# Variantes servies par /api/media/images : cache navigateur et CDN, selon Accept
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+
+# Champs propres au contenu, partagés par les médias de même SHA-256
+CONTENT_FIELDS = {
+    "_id": 0, "safeName": 1, "size": 1, "sha256": 1, "url": 1,
+    "thumbnail": 1, "thumbnailStatus": 1, "dimensions": 1, "derivatives": 1
+}
+
+def schedule_thumbnail(file_data: dict):
+    """Miniature, dérivés et dimensions calculés en arrière-plan (voir image_processing.py)"""
+    if file_data.get("thumbnailStatus") == "pending":
+        image_processor.submit(file_data["sha256"], UPLOAD_DIR / file_data["safeName"], UPLOAD_DIR, THUMBNAIL_DIR)
+
+# Compteur de références par contenu : {sha256, safeName, refs}
+BLOB_COLLECTION = "media_blobs"
+REMOVAL_WAIT = 5  # secondes d'attente au plus pour une suppression de fichiers en cours
+
+async def retain_content(sha256: str) -> dict:
+    """Ajouter une référence au contenu, avant toute décision de réutilisation
+
+    Tant que la référence est tenue, les fichiers du contenu ne peuvent pas
+    être supprimés. Si la dernière référence précédente est en train de les
+    supprimer, on attend la fin de la suppression.
+    """
+    blobs = await get_collection(BLOB_COLLECTION)
+    blob = await blobs.find_one_and_update(
+        {"sha256": sha256}, {"$inc": {"refs": 1}},
+        upsert=True, return_document=ReturnDocument.AFTER
+    )
+    deadline = time.monotonic() + REMOVAL_WAIT
+    while blob.get("removing") and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        blob = await blobs.find_one({"sha256": sha256})
+    return blob
+
+async def release_content(sha256: str):
+    """Retirer une référence au contenu
+
+    Renvoie True si l'appelant doit supprimer les fichiers (dernière
+    référence, suppression réservée), False sinon, et None pour un contenu
+    sans compteur (stocké avant le comptage des références).
+    """
+    blobs = await get_collection(BLOB_COLLECTION)
+    blob = await blobs.find_one_and_update(
+        {"sha256": sha256}, {"$inc": {"refs": -1}}, return_document=ReturnDocument.AFTER
+    )
+    if blob is None:
+        return None
+    if blob["refs"] > 0:
+        return False
+    claimed = await blobs.update_one(
+        {"sha256": sha256, "refs": {"$lte": 0}, "removing": {"$exists": False}},
+        {"$set": {"removing": True}}
+    )
+    return claimed.modified_count == 1
+
+async def finish_removal(sha256: str):
+    """Supprimer le compteur une fois les fichiers supprimés, ou le rendre à un nouvel upload"""
+    blobs = await get_collection(BLOB_COLLECTION)
+    result = await blobs.delete_one({"sha256": sha256, "refs": {"$lte": 0}})
+    if not result.deleted_count:
+        await blobs.update_one({"sha256": sha256}, {"$unset": {"removing": ""}})
+
+def remove_content_files(file_data: dict):
+    """Supprimer le fichier, la miniature, les dérivés et les variantes d'un contenu"""
     try:
-        with Image.open(file_path) as img:
-            # Convertir en RGB si nécessaire
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            
-            # Créer la miniature
-            img.thumbnail(size, Image.Resampling.LANCZOS)
-            img.save(thumbnail_path, "JPEG", quality=85)
-            return True
+        file_path = UPLOAD_DIR / file_data["safeName"]
+        if file_path.exists():
+            os.unlink(file_path)
+        
+        # Supprimer la miniature si elle existe
+        if file_data.get("thumbnail") and "thumbnails/" in file_data["thumbnail"]:
+            thumbnail_name = file_data["thumbnail"].split("/")[-1]
+            thumbnail_path = THUMBNAIL_DIR / thumbnail_name
+            if thumbnail_path.exists():
+                os.unlink(thumbnail_path)
+        
+        # Supprimer les dérivés (WebP, AVIF, JPEG par largeur)
+        for derivative_dir in {Path(d["path"]).parent for d in file_data.get("derivatives") or []}:
+            shutil.rmtree(UPLOAD_DIR / derivative_dir, ignore_errors=True)
+        resize_cache.discard(file_data["safeName"])
     except Exception as e:
-        print(f"Erreur génération miniature: {e}")
-        return False
+        print(f"Erreur suppression fichier physique: {e}")
+
+async def store_content(staged, extension: str, file_type: str) -> dict:
+    """Stocker le fichier sous son SHA-256 et renvoyer les champs de contenu
+
+    Un contenu déjà présent n'est ni réécrit ni retraité : le nouveau média
+    reprend le fichier, la miniature et les dérivés existants (le traitement
+    n'est relancé que s'il a échoué ou s'il a été interrompu). La référence
+    est comptée (media_blobs) avant de décider de réutiliser le fichier, une
+    suppression concurrente ne peut donc pas le retirer entre-temps.
+    """
+    blob = await retain_content(staged.sha256)
+    collection = await get_collection("media_files")
+    if blob.get("safeName") and (UPLOAD_DIR / blob["safeName"]).exists():
+        existing = await collection.find_one({"sha256": staged.sha256, "safeName": blob["safeName"]}, CONTENT_FIELDS)
+        if existing:
+            staged.discard()
+            status = existing.get("thumbnailStatus")
+            if status == "failed" or (status == "pending" and not image_processor.is_processing(staged.sha256)):
+                # Traitement en échec ou interrompu : relancé pour tous les médias du contenu
+                existing["thumbnailStatus"] = "pending"
+                await collection.update_many({"sha256": staged.sha256}, {"$set": {"thumbnailStatus": "pending"}})
+            return existing
+    
+    safe_filename = blob.get("safeName") or f"{staged.sha256}{extension.lower()}"
+    staged.commit(UPLOAD_DIR / safe_filename)
+    blobs = await get_collection(BLOB_COLLECTION)
+    await blobs.update_one({"sha256": staged.sha256}, {"$set": {"safeName": safe_filename}})
+    
+    # La miniature des images est générée en arrière-plan
+    if file_type == "image":
+        thumbnail_url = DEFAULT_THUMBNAIL
+        thumbnail_status = "pending"
+    else:
+        thumbnail_url = f"/api/media/default-{file_type}-thumbnail.png"
+        thumbnail_status = None
+    
+    return {
+        "safeName": safe_filename,
+        "size": staged.size,
+        "sha256": staged.sha256,
+        "url": f"/api/media/files/{safe_filename}",
+        "thumbnail": thumbnail_url,
+        "thumbnailStatus": thumbnail_status,
+        "dimensions": None
+    }
+
+async def backfill_media_blobs():
+    """Créer les compteurs des contenus stockés avant le comptage des références"""
+    await aggregate_documents("media_files", [
+        {"$match": {"sha256": {"$type": "string"}, "safeName": {"$type": "string"}}},
+        # Seuls les fichiers nommés d'après leur SHA-256 sont partagés
+        {"$match": {"$expr": {"$eq": [{"$substrBytes": ["$safeName", 0, 64]}, "$sha256"]}}},
+        {"$group": {"_id": "$sha256", "safeName": {"$first": "$safeName"}, "refs": {"$sum": 1}}},
+        {"$project": {"_id": 0, "sha256": "$_id", "safeName": 1, "refs": 1}},
+        {"$merge": {"into": BLOB_COLLECTION, "on": "sha256", "whenMatched": "keepExisting", "whenNotMatched": "insert"}}
+    ])
 
 @router.get("/files")
 async def get_media_files(
@@ -69,6 +207,7 @@ async def get_media_files(
     sort_order: str = Query("desc", description="Ordre: asc, desc"),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente"),
     current_user=Depends(get_current_admin)
 ):
     """Récupérer la liste des fichiers média"""
@@ -83,21 +222,42 @@ async def get_media_files(
             filter_query["type"] = file_type
         
         if search:
-            filter_query["name"] = {"$regex": search, "$options": "i"}
+            filter_query["name"] = {"$regex": re.escape(search), "$options": "i"}
         
         # Tri
         sort_field = "createdAt" if sort_by == "date" else sort_by
         sort_direction = -1 if sort_order == "desc" else 1
+        count_mode = "exact" if filter_query else "estimated"
+        next_cursor = None
         
         # Récupérer les fichiers
-        files, total = await get_documents(
-            "media_files",
-            filter_query,
-            skip=(page - 1) * limit,
-            limit=limit,
-            sort_field=sort_field,
-            sort_direction=sort_direction
-        )
+        if page > 1 and not cursor:
+            # Pagination par offset (compatibilité)
+            files, total = await get_documents(
+                "media_files",
+                filter_query,
+                skip=(page - 1) * limit,
+                limit=limit,
+                sort_field=sort_field,
+                sort_direction=sort_direction,
+                count=count_mode
+            )
+            has_more = (page * limit) < total
+        else:
+            # Pagination par curseur : coût constant quelle que soit la profondeur
+            files, next_cursor, total = await get_documents_page(
+                "media_files",
+                filter_query,
+                limit=limit,
+                cursor=cursor,
+                sort_field=sort_field,
+                sort_direction=sort_direction,
+                count=count_mode
+            )
+            has_more = next_cursor is not None
+        
+        for file_data in files:
+            file_data.pop('_id', None)
         
         return ApiResponse(
             success=True,
@@ -107,10 +267,13 @@ async def get_media_files(
                 "total": total,
                 "page": page,
                 "limit": limit,
-                "hasMore": (page * limit) < total
+                "hasMore": has_more,
+                "nextCursor": next_cursor
             }
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur récupération fichiers: {str(e)}")
 
@@ -126,11 +289,7 @@ async def upload_media_files(
     
     for file in files:
         try:
-            # Validation de la taille
-            content = await file.read()
-            if len(content) > MAX_FILE_SIZE:
-                errors.append(f"{file.filename}: Fichier trop volumineux (max {MAX_FILE_SIZE // 1024 // 1024}MB)")
-                continue
+            too_large = f"{file.filename}: Fichier trop volumineux (max {MAX_FILE_SIZE // 1024 // 1024}MB)"
             
             # Validation du type
             file_type = get_file_type(file.content_type)
@@ -138,56 +297,38 @@ async def upload_media_files(
                 errors.append(f"{file.filename}: Type de fichier non autorisé")
                 continue
             
-            # Générer un nom unique
-            file_id = str(uuid.uuid4())
-            file_extension = Path(file.filename).suffix
-            safe_filename = f"{file_id}{file_extension}"
-            file_path = UPLOAD_DIR / safe_filename
+            # Taille annoncée : rejet sans rien copier
+            if file.size is not None and file.size > MAX_FILE_SIZE:
+                errors.append(too_large)
+                continue
             
-            # Sauvegarder le fichier
-            async with aiofiles.open(file_path, 'wb') as f:
-                await f.write(content)
+            # Copie par blocs vers un fichier temporaire (taille et hash calculés au passage)
+            try:
+                staged = await stage_upload(iter_upload(file), UPLOAD_DIR, MAX_FILE_SIZE)
+            except FileTooLargeError:
+                errors.append(too_large)
+                continue
             
-            # Générer une miniature pour les images
-            thumbnail_path = None
-            dimensions = None
-            if file_type == "image":
-                thumbnail_filename = f"thumb_{file_id}.jpg"
-                thumbnail_path = THUMBNAIL_DIR / thumbnail_filename
-                
-                # Générer la miniature
-                if generate_thumbnail(file_path, thumbnail_path):
-                    thumbnail_url = f"/api/media/thumbnails/{thumbnail_filename}"
-                    
-                    # Obtenir les dimensions de l'image originale
-                    try:
-                        with Image.open(file_path) as img:
-                            dimensions = {"width": img.width, "height": img.height}
-                    except:
-                        pass
-                else:
-                    thumbnail_url = f"/api/media/default-thumbnail.png"
-            else:
-                thumbnail_url = f"/api/media/default-{file_type}-thumbnail.png"
+            # Stockage adressé par le contenu (doublon : métadonnées seules)
+            content = await store_content(staged, Path(file.filename).suffix, file_type)
             
             # Métadonnées du fichier
+            file_id = str(uuid.uuid4())
             file_data = {
                 "id": file_id,
                 "name": file.filename,
-                "safeName": safe_filename,
                 "type": file_type,
                 "contentType": file.content_type,
-                "size": len(content),
+                **content,
                 "folder": folder,
-                "url": f"/api/media/files/{safe_filename}",
-                "thumbnail": thumbnail_url,
-                "dimensions": dimensions,
+                "imageUrl": f"/api/media/images/{file_id}" if file_type == "image" else None,
                 "createdAt": datetime.now().isoformat(),
                 "uploadedBy": current_user.id
             }
             
             # Sauvegarder en base de données
             await create_document("media_files", file_data)
+            schedule_thumbnail(file_data)
             uploaded_files.append(file_data)
             
         except Exception as e:
@@ -227,60 +368,44 @@ async def upload_base64_image(
         if content_type not in ALLOWED_IMAGE_TYPES:
             raise HTTPException(status_code=400, detail="Type d'image non autorisé")
         
+        # Validation de la taille avant décodage (4 caractères base64 = 3 octets)
+        too_large = f"Image trop volumineuse (max {MAX_FILE_SIZE // 1024 // 1024}MB)"
+        if len(data) // 4 * 3 > MAX_FILE_SIZE + 2:
+            raise HTTPException(status_code=400, detail=too_large)
+        
         # Décoder les données
         try:
             image_bytes = base64.b64decode(data)
         except Exception:
             raise HTTPException(status_code=400, detail="Données base64 invalides")
         
-        # Validation de la taille
-        if len(image_bytes) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"Image trop volumineuse (max {MAX_FILE_SIZE // 1024 // 1024}MB)")
+        # Écriture via un fichier temporaire puis renommage atomique
+        try:
+            staged = await stage_upload(iter_bytes(image_bytes), UPLOAD_DIR, MAX_FILE_SIZE)
+        except FileTooLargeError:
+            raise HTTPException(status_code=400, detail=too_large)
         
-        # Générer un nom unique
-        file_id = str(uuid.uuid4())
+        # Stockage adressé par le contenu (doublon : métadonnées seules)
         extension = mimetypes.guess_extension(content_type) or '.png'
-        safe_filename = f"{file_id}{extension}"
-        file_path = UPLOAD_DIR / safe_filename
-        
-        # Sauvegarder le fichier
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(image_bytes)
-        
-        # Générer une miniature
-        thumbnail_filename = f"thumb_{file_id}.jpg"
-        thumbnail_path = THUMBNAIL_DIR / thumbnail_filename
-        thumbnail_url = f"/api/media/thumbnails/{thumbnail_filename}"
-        
-        if not generate_thumbnail(file_path, thumbnail_path):
-            thumbnail_url = f"/api/media/default-thumbnail.png"
-        
-        # Obtenir les dimensions
-        dimensions = None
-        try:
-            with Image.open(file_path) as img:
-                dimensions = {"width": img.width, "height": img.height}
-        except:
-            pass
+        content = await store_content(staged, extension, "image")
         
         # Métadonnées du fichier
+        file_id = str(uuid.uuid4())
         file_data = {
             "id": file_id,
             "name": filename,
-            "safeName": safe_filename,
             "type": "image",
             "contentType": content_type,
-            "size": len(image_bytes),
+            **content,
             "folder": folder,
-            "url": f"/api/media/files/{safe_filename}",
-            "thumbnail": thumbnail_url,
-            "dimensions": dimensions,
+            "imageUrl": f"/api/media/images/{file_id}",
             "createdAt": datetime.now().isoformat(),
             "uploadedBy": current_user.id
         }
         
         # Sauvegarder en base de données
         await create_document("media_files", file_data)
+        schedule_thumbnail(file_data)
         
         return ApiResponse(
             success=True,
@@ -301,31 +426,30 @@ async def delete_media_file(
     """Supprimer un fichier média"""
     try:
         # Récupérer les informations du fichier
-        files, _ = await get_documents("media_files", {"id": file_id}, limit=1)
+        files, _ = await get_documents("media_files", {"id": file_id}, limit=1, count="none")
         
         if not files:
             raise HTTPException(status_code=404, detail="Fichier non trouvé")
         
         file_data = files[0]
         
-        # Supprimer les fichiers physiques
-        try:
-            file_path = UPLOAD_DIR / file_data["safeName"]
-            if file_path.exists():
-                os.unlink(file_path)
-            
-            # Supprimer la miniature si elle existe
-            if file_data.get("thumbnail") and "thumbnails/" in file_data["thumbnail"]:
-                thumbnail_name = file_data["thumbnail"].split("/")[-1]
-                thumbnail_path = THUMBNAIL_DIR / thumbnail_name
-                if thumbnail_path.exists():
-                    os.unlink(thumbnail_path)
-        except Exception as e:
-            print(f"Erreur suppression fichier physique: {e}")
-        
         # Supprimer de la base de données
         await delete_document("media_files", file_id)
         
+        # Fichiers physiques partagés : supprimés avec la dernière référence
+        sha256 = file_data.get("sha256")
+        content_addressed = sha256 and file_data["safeName"].startswith(sha256)
+        remove = await release_content(sha256) if content_addressed else None
+        if remove is None:
+            # Fichier stocké avant le comptage des références
+            if not await count_documents("media_files", {"safeName": file_data["safeName"]}):
+                remove_content_files(file_data)
+        elif remove:
+            try:
+                remove_content_files(file_data)
+            finally:
+                await finish_removal(sha256)
+        
         return ApiResponse(
             success=True,
             message="Fichier supprimé avec succès"
@@ -347,7 +471,7 @@ async def create_folder(
         folder_path = f"{parent}/{name}" if parent else name
         
         # Vérifier si le dossier existe déjà
-        existing, _ = await get_documents("media_folders", {"path": folder_path}, limit=1)
+        existing, _ = await get_documents("media_folders", {"path": folder_path}, limit=1, count="none")
         if existing:
             raise HTTPException(status_code=400, detail="Un dossier avec ce nom existe déjà")
         
@@ -399,4 +523,36 @@ async def get_folders(
         )
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur récupération dossiers: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Erreur récupération dossiers: {str(e)}")
+
+@public_router.get("/images/{file_id}")
+async def get_image(
+    file_id: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="Largeur d'affichage souhaitée"),
+):
+    """Servir la meilleure variante d'une image pour l'en-tête Accept (AVIF, WebP, sinon JPEG)"""
+    file_data = await get_document(
+        "media_files", file_id,
+        {"_id": 0, "type": 1, "safeName": 1, "contentType": 1, "derivatives": 1}
+    )
+    if not file_data or file_data.get("type") != "image":
+        raise HTTPException(status_code=404, detail="Image non trouvée")
+    
+    # Original tant que les dérivés ne sont pas prêts
+    variant = choose_variant(file_data.get("derivatives") or [], request.headers.get("accept", ""), w)
+    if variant:
+        file_path = UPLOAD_DIR / variant["path"]
+        media_type = DERIVATIVE_FORMATS[variant["format"]]["contentType"]
+    else:
+        file_path = UPLOAD_DIR / file_data["safeName"]
+        media_type = file_data.get("contentType")
+    
+    etag = make_etag(file_id, file_path.name)
+    headers = {"ETag": etag, "Cache-Control": IMAGE_CACHE_CONTROL, "Vary": "Accept"}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    if not file_path.exists():
+        raise HTTPException(status_code=404, detail="Image non trouvée")
+    
+    return FileResponse(file_path, media_type=media_type, headers=headers)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
 import sys
 from pathlib import Path
@@ -7,78 +7,140 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from models import Article, ArticleCreate, ArticleUpdate, ArticleListResponse, ApiResponse
-from database import get_documents, get_document, create_document, update_document, delete_document, search_documents
+from models import (
+    Article, ArticleCreate, ArticleUpdate, ArticleSummary, ArticleSummaryListResponse, ApiResponse
+)
+from database import (
+    get_documents, get_documents_page, get_document, create_document,
+    update_document, delete_document, InvalidCursorError
+)
+from search import search_articles
+from cache import cached, invalidate
+from conditional import document_validators, list_validators, is_not_modified, not_modified, set_validators
 import re
 from datetime import datetime
 
 router = APIRouter(prefix="/api/news", tags=["news"])
 
-@router.get("/", response_model=ArticleListResponse)
-async def get_articles(
-    category: Optional[str] = Query(None, description="Filter by category"),
-    search: Optional[str] = Query(None, description="Search in title and content"),
-    limit: int = Query(10, ge=1, le=50, description="Number of articles per page"),
-    offset: int = Query(0, ge=0, description="Pagination offset"),
-    sort: str = Query("date", regex="^(date|title)$", description="Sort by date or title")
-):
-    """Get all articles with optional filters"""
-    try:
-        filter_dict = {}
-        
-        # Category filter
-        if category and category != "all":
-            filter_dict["category"] = category
+# List views never load the article content
+SUMMARY_PROJECTION = {"_id": 0, **{field: 1 for field in ArticleSummary.model_fields}}
+
+async def load_articles_page(category: Optional[str], search: Optional[str], limit: int,
+                             offset: int, cursor: Optional[str], sort: str):
+    """Load one page of the public article list"""
+    filter_dict = {}
+    next_cursor = None
+    
+    # Category filter
+    if category and category != "all":
+        filter_dict["category"] = category
+    
+    # Search functionality (full-text index, ranked by relevance)
+    if search:
+        articles, next_cursor, total = await search_articles(
+            search,
+            filter_dict,
+            limit=limit,
+            cursor=cursor,
+            skip=0 if cursor else offset,
+            projection=SUMMARY_PROJECTION
+        )
+        has_more = next_cursor is not None
+    else:
+        # Sort configuration
+        sort_field = "date" if sort == "date" else "title"
+        sort_direction = -1 if sort == "date" else 1
         
-        # Search functionality
-        if search:
-            articles, total = await search_documents(
-                "articles", 
-                search, 
-                ["title", "excerpt", "content", "tags"],
-                skip=offset, 
-                limit=limit
-            )
-        else:
-            # Sort configuration
-            sort_field = "date" if sort == "date" else "title"
-            sort_direction = -1 if sort == "date" else 1
-            
+        if offset and not cursor:
+            # Legacy offset pagination
             articles, total = await get_documents(
                 "articles", 
                 filter_dict, 
                 skip=offset, 
                 limit=limit,
                 sort_field=sort_field,
-                sort_direction=sort_direction
+                sort_direction=sort_direction,
+                projection=SUMMARY_PROJECTION
             )
-        
-        # Convert to Article models
-        article_objects = []
-        for article in articles:
-            article.pop('_id', None)  # Remove MongoDB _id
-            article_objects.append(Article(**article))
-        
-        # Sort pinned articles first
+            has_more = (offset + limit) < total
+        else:
+            # Keyset pagination: every page costs the same as the first one
+            articles, next_cursor, total = await get_documents_page(
+                "articles",
+                filter_dict,
+                limit=limit,
+                cursor=cursor,
+                sort_field=sort_field,
+                sort_direction=sort_direction,
+                count="exact" if filter_dict else "estimated",
+                projection=SUMMARY_PROJECTION
+            )
+            has_more = next_cursor is not None
+    
+    # Convert to ArticleSummary models
+    article_objects = []
+    for article in articles:
+        article.pop('_id', None)  # Remove MongoDB _id
+        article_objects.append(ArticleSummary(**article))
+    
+    # Sort pinned articles first (search results keep their relevance order)
+    if not search:
         article_objects.sort(key=lambda x: (not x.isPinned, x.date), reverse=True)
+    
+    return ArticleSummaryListResponse(
+        articles=article_objects,
+        total=total,
+        hasMore=has_more,
+        nextCursor=next_cursor
+    )
+
+@router.get("/", response_model=ArticleSummaryListResponse)
+async def get_articles(
+    request: Request,
+    response: Response,
+    category: Optional[str] = Query(None, description="Filter by category"),
+    search: Optional[str] = Query(None, description="Search in title and content"),
+    limit: int = Query(10, ge=1, le=50, description="Number of articles per page"),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    sort: str = Query("date", regex="^(date|title)$", description="Sort by date or title")
+):
+    """Get all articles with optional filters"""
+    try:
+        etag, last_modified = await list_validators(
+            "news", "articles", None, category, search, limit, offset, cursor, sort
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_validators(response, etag, last_modified)
         
-        return ArticleListResponse(
-            articles=article_objects,
-            total=total,
-            hasMore=(offset + limit) < total
+        cache_key = f"news:list:{category}:{search}:{limit}:{offset}:{cursor}:{sort}"
+        return await cached(
+            cache_key,
+            lambda: load_articles_page(category, search, limit, offset, cursor, sort)
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching articles: {str(e)}")
 
 @router.get("/{article_id}", response_model=Article)
-async def get_article(article_id: str):
+async def get_article(article_id: str, request: Request, response: Response):
     """Get a specific article by ID"""
     try:
+        # Revalidation only reads the version, not the content
+        validators = await document_validators("articles", article_id)
+        if not validators:
+            raise HTTPException(status_code=404, detail="Article not found")
+        if is_not_modified(request, *validators):
+            return not_modified(*validators)
+        
         article = await get_document("articles", article_id)
         if not article:
             raise HTTPException(status_code=404, detail="Article not found")
         
+        set_validators(response, *validators)
         article.pop('_id', None)
         return Article(**article)
         
@@ -95,6 +157,7 @@ async def create_article(article: ArticleCreate):
         article_obj = Article(**article_dict)
         
         await create_document("articles", article_obj.dict())
+        await invalidate("news")
         
         return ApiResponse(
             success=True,
@@ -125,6 +188,8 @@ async def update_article(article_id: str, article_update: ArticleUpdate):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update article")
         
+        await invalidate("news")
+        
         return ApiResponse(
             success=True,
             message="Article mis à jour avec succès"
@@ -149,6 +214,8 @@ async def delete_article(article_id: str):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete article")
         
+        await invalidate("news")
+        
         return ApiResponse(
             success=True,
             message="Article supprimé avec succès"
@@ -163,14 +230,17 @@ async def delete_article(article_id: str):
 async def get_categories():
     """Get all unique categories"""
     try:
-        articles, _ = await get_documents("articles", {}, limit=1000)
-        categories = list(set([article.get("category", "") for article in articles if article.get("category")]))
-        categories.sort()
+        async def load_categories():
+            articles, _ = await get_documents("articles", {}, limit=1000, count="none")
+            categories = list(set([article.get("category", "") for article in articles if article.get("category")]))
+            categories.sort()
+            
+            return {
+                "categories": categories,
+                "total": len(categories)
+            }
         
-        return {
-            "categories": categories,
-            "total": len(categories)
-        }
+        return await cached("news:categories", load_categories)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching categories: {str(e)}")
@@ -179,18 +249,21 @@ async def get_categories():
 async def get_tags():
     """Get all unique tags"""
     try:
-        articles, _ = await get_documents("articles", {}, limit=1000)
-        all_tags = []
-        for article in articles:
-            all_tags.extend(article.get("tags", []))
-        
-        unique_tags = list(set(all_tags))
-        unique_tags.sort()
-        
-        return {
-            "tags": unique_tags,
-            "total": len(unique_tags)
-        }
+        async def load_tags():
+            articles, _ = await get_documents("articles", {}, limit=1000, count="none")
+            all_tags = []
+            for article in articles:
+                all_tags.extend(article.get("tags", []))
+            
+            unique_tags = list(set(all_tags))
+            unique_tags.sort()
+            
+            return {
+                "tags": unique_tags,
+                "total": len(unique_tags)
+            }
+        
+        return await cached("news:tags", load_tags)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching tags: {str(e)}")
\ No newline at end of file
@@ -14,7 +14,7 @@ async def subscribe_newsletter(subscription: NewsletterSubscriptionRequest):
     """Subscribe to newsletter"""
     try:
         # Check if email already exists
-        existing_subs, _ = await get_documents("newsletter", {"email": subscription.email}, limit=1)
+        existing_subs, _ = await get_documents("newsletter", {"email": subscription.email}, limit=1, count="none")
         
         if existing_subs:
             # Reactivate if was unsubscribed
@@ -48,7 +48,7 @@ async def unsubscribe_newsletter(subscription: NewsletterSubscriptionRequest):
     """Unsubscribe from newsletter"""
     try:
         # Find subscription
-        existing_subs, _ = await get_documents("newsletter", {"email": subscription.email}, limit=1)
+        existing_subs, _ = await get_documents("newsletter", {"email": subscription.email}, limit=1, count="none")
         
         if not existing_subs:
             return ApiResponse(
@@ -76,7 +76,8 @@ async def get_newsletter_subscriptions():
             {"active": True}, 
             limit=1000,
             sort_field="subscribed_at",
-            sort_direction=-1
+            sort_direction=-1,
+            count="none"
         )
         
         subscription_objects = []
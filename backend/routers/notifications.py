@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Optional
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
 import uuid
 from pydantic import BaseModel
 
@@ -12,6 +12,7 @@ sys.path.insert(0, str(backend_dir))
 
 from models import ApiResponse
 from database import get_documents, create_document, update_document, delete_document
+from notification_retention import retention_fields, purge_notifications
 
 # Import auth functions directly
 try:
@@ -170,7 +171,7 @@ async def mark_notification_as_read(
     """Marquer une notification comme lue"""
     try:
         # Vérifier que la notification existe
-        notifications, _ = await get_documents("notifications", {"id": notification_id}, limit=1)
+        notifications, _ = await get_documents("notifications", {"id": notification_id}, limit=1, count="none")
         
         if not notifications:
             raise HTTPException(status_code=404, detail="Notification non trouvée")
@@ -195,7 +196,7 @@ async def mark_all_notifications_as_read(
     """Marquer toutes les notifications comme lues"""
     try:
         # Récupérer toutes les notifications non lues
-        unread_notifications, _ = await get_documents("notifications", {"read": False})
+        unread_notifications, _ = await get_documents("notifications", {"read": False}, count="none")
         
         # Marquer chacune comme lue
         for notification in unread_notifications:
@@ -220,7 +221,7 @@ async def delete_notification(
     """Supprimer une notification"""
     try:
         # Vérifier que la notification existe
-        notifications, _ = await get_documents("notifications", {"id": notification_id}, limit=1)
+        notifications, _ = await get_documents("notifications", {"id": notification_id}, limit=1, count="none")
         
         if not notifications:
             raise HTTPException(status_code=404, detail="Notification non trouvée")
@@ -240,24 +241,12 @@ async def delete_notification(
 
 @router.delete("/")
 async def delete_old_notifications(
-    days: int = Query(30, ge=1, description="Supprimer les notifications plus anciennes que X jours"),
+    days: Optional[int] = Query(None, ge=1, description="Supprimer les notifications plus anciennes que X jours (par défaut : rétention de chaque type)"),
     current_admin = Depends(get_current_admin)
 ):
     """Supprimer les anciennes notifications"""
     try:
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        # Récupérer les anciennes notifications
-        old_notifications, _ = await get_documents(
-            "notifications",
-            {"createdAt": {"$lt": cutoff_date.isoformat()}}
-        )
-        
-        # Supprimer chacune
-        deleted_count = 0
-        for notification in old_notifications:
-            await delete_document("notifications", notification["id"])
-            deleted_count += 1
+        deleted_count = await purge_notifications(list(NOTIFICATION_TYPES), days)
         
         return ApiResponse(
             success=True,
@@ -284,7 +273,7 @@ async def create_notification(
             "message": notification.message,
             "link": notification.link,
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields(notification.type),
             "createdBy": str(current_admin.id)  # Ensure it's a string
         }
         
@@ -324,7 +313,7 @@ async def create_system_notification(type: str, title: str, message: str, link:
             "message": message,
             "link": link,
             "read": False,
-            "createdAt": datetime.now().isoformat(),
+            **retention_fields(type),
             "createdBy": "system"
         }
         
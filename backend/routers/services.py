@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 import sys
 from pathlib import Path
 
@@ -8,40 +8,58 @@ sys.path.insert(0, str(backend_dir))
 
 from models import Service, ServiceCreate, ApiResponse
 from database import get_documents, get_document, create_document, update_document, delete_document
+from cache import cached, invalidate
+from conditional import document_validators, is_not_modified, list_validators, not_modified, set_validators
 from typing import List
 
 router = APIRouter(prefix="/api/services", tags=["services"])
 
 @router.get("/", response_model=List[Service])
-async def get_services():
+async def get_services(request: Request, response: Response):
     """Get all active services"""
     try:
-        services, _ = await get_documents(
-            "services", 
-            {"active": True}, 
-            limit=100,
-            sort_field="created_at",
-            sort_direction=1
-        )
-        
-        service_objects = []
-        for service in services:
-            service.pop('_id', None)
-            service_objects.append(Service(**service))
-        
-        return service_objects
+        etag, last_modified = await list_validators("services", "services", {"active": True})
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+        set_validators(response, etag, last_modified)
+        
+        async def load_services():
+            services, _ = await get_documents(
+                "services", 
+                {"active": True}, 
+                limit=100,
+                sort_field="created_at",
+                sort_direction=1,
+                count="none"
+            )
+            
+            service_objects = []
+            for service in services:
+                service.pop('_id', None)
+                service_objects.append(Service(**service))
+            
+            return service_objects
+        
+        return await cached("services:list", load_services)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching services: {str(e)}")
 
 @router.get("/{service_id}", response_model=Service)
-async def get_service(service_id: str):
+async def get_service(service_id: str, request: Request, response: Response):
     """Get a specific service by ID"""
     try:
+        validators = await document_validators("services", service_id)
+        if not validators:
+            raise HTTPException(status_code=404, detail="Service not found")
+        if is_not_modified(request, *validators):
+            return not_modified(*validators)
+        
         service = await get_document("services", service_id)
         if not service:
             raise HTTPException(status_code=404, detail="Service not found")
         
+        set_validators(response, *validators)
         service.pop('_id', None)
         return Service(**service)
         
@@ -57,6 +75,7 @@ async def create_service(service: ServiceCreate):
         service_obj = Service(**service.dict())
         
         await create_document("services", service_obj.dict())
+        await invalidate("services")
         
         return ApiResponse(
             success=True,
@@ -81,6 +100,8 @@ async def update_service(service_id: str, service_update: ServiceCreate):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update service")
         
+        await invalidate("services")
+        
         return ApiResponse(
             success=True,
             message="Service mis à jour avec succès"
@@ -104,6 +125,8 @@ async def delete_service(service_id: str):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete service")
         
+        await invalidate("services")
+        
         return ApiResponse(
             success=True,
             message="Service supprimé avec succès"
@@ -8,6 +8,7 @@ sys.path.insert(0, str(backend_dir))
 
 from models import Testimonial, TestimonialCreate, ApiResponse
 from database import get_documents, get_document, create_document, update_document, delete_document
+from cache import cached, invalidate
 from typing import List
 
 router = APIRouter(prefix="/api/testimonials", tags=["testimonials"])
@@ -16,20 +17,24 @@ router = APIRouter(prefix="/api/testimonials", tags=["testimonials"])
 async def get_testimonials():
     """Get all active testimonials"""
     try:
-        testimonials, _ = await get_documents(
-            "testimonials", 
-            {"active": True}, 
-            limit=100,
-            sort_field="created_at",
-            sort_direction=-1
-        )
-        
-        testimonial_objects = []
-        for testimonial in testimonials:
-            testimonial.pop('_id', None)
-            testimonial_objects.append(Testimonial(**testimonial))
+        async def load_testimonials():
+            testimonials, _ = await get_documents(
+                "testimonials", 
+                {"active": True}, 
+                limit=100,
+                sort_field="created_at",
+                sort_direction=-1,
+                count="none"
+            )
+            
+            testimonial_objects = []
+            for testimonial in testimonials:
+                testimonial.pop('_id', None)
+                testimonial_objects.append(Testimonial(**testimonial))
+            
+            return testimonial_objects
         
-        return testimonial_objects
+        return await cached("testimonials:list", load_testimonials)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching testimonials: {str(e)}")
@@ -41,6 +46,7 @@ async def create_testimonial(testimonial: TestimonialCreate):
         testimonial_obj = Testimonial(**testimonial.dict())
         
         await create_document("testimonials", testimonial_obj.dict())
+        await invalidate("testimonials")
         
         return ApiResponse(
             success=True,
@@ -65,6 +71,8 @@ async def update_testimonial(testimonial_id: str, testimonial_update: Testimonia
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update testimonial")
         
+        await invalidate("testimonials")
+        
         return ApiResponse(
             success=True,
             message="Témoignage mis à jour avec succès"
@@ -88,6 +96,8 @@ async def delete_testimonial(testimonial_id: str):
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete testimonial")
         
+        await invalidate("testimonials")
+        
         return ApiResponse(
             success=True,
             message="Témoignage supprimé avec succès"
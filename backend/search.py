@@ -0,0 +1,66 @@
+"""
+Full-text article search.
+
+Queries go through the `articles_text` index declared in indexes.py: French
+stemming, case and accent folding, relevance ranking with `textScore`.
+Pages are chained with a (score, id) cursor so deep pages don't skip.
+"""
+import asyncio
+
+from database import (
+    get_collection, aggregate_documents, encode_cursor, decode_cursor
+)
+
+SCORE_FIELD = "_score"
+
+def text_filter(query: str, filter_dict: dict = None) -> dict:
+    match = dict(filter_dict or {})
+    match["$text"] = {"$search": query}
+    return match
+
+def search_pipeline(query: str, filter_dict: dict = None, limit: int = 10,
+                    cursor: str = None, skip: int = 0, projection: dict = None) -> list:
+    pipeline = [
+        {"$match": text_filter(query, filter_dict)},
+        {"$addFields": {SCORE_FIELD: {"$meta": "textScore"}}},
+    ]
+
+    if cursor:
+        position = decode_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {SCORE_FIELD: {"$lt": position["v"]}},
+            {SCORE_FIELD: position["v"], "id": {"$lt": position["id"]}}
+        ]}})
+
+    pipeline.append({"$sort": {SCORE_FIELD: -1, "id": -1}})
+    if skip:
+        pipeline.append({"$skip": skip})
+    pipeline.append({"$limit": limit + 1})
+    if projection:
+        # Inclusion projection, applied last so the keyset fields stay available
+        pipeline.append({"$project": {**projection, SCORE_FIELD: 1, "id": 1}})
+    return pipeline
+
+async def search_articles(query: str, filter_dict: dict = None, limit: int = 10,
+                          cursor: str = None, skip: int = 0, projection: dict = None):
+    """Relevance-ranked article search
+    
+    Returns (documents, next_cursor, total). Raises InvalidCursorError on an
+    invalid cursor.
+    """
+    collection = await get_collection("articles")
+    documents, total = await asyncio.gather(
+        aggregate_documents("articles", search_pipeline(query, filter_dict, limit, cursor, skip, projection)),
+        collection.count_documents(text_filter(query, filter_dict))
+    )
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        next_cursor = encode_cursor({"v": last[SCORE_FIELD], "id": last.get("id")})
+
+    for document in documents:
+        document.pop(SCORE_FIELD, None)
+
+    return documents, next_cursor, total
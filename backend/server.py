@@ -10,6 +10,13 @@ from pathlib import Path
 
 # Import database functions
 from database import connect_to_mongo, close_mongo_connection
+from indexes import ensure_indexes
+from tickets import backfill_ticket_summaries
+from notification_retention import backfill_notification_dates
+from cache import start_cache, stop_cache
+from passwords import password_hasher
+from image_processing import image_processor
+from image_resizing import MediaFiles
 
 # Import routers
 from routers import news, contact, services, testimonials, competences, faq, newsletter, auth, admin, client, analytics, media, notifications
@@ -32,10 +39,31 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_mongo()
+    await ensure_indexes()  # Declared indexes (idempotent)
+    try:
+        await backfill_ticket_summaries()  # Counters of tickets created before they existed
+    except Exception as e:
+        logger.warning(f"⚠️ Ticket summaries backfill failed, run python tickets.py: {str(e)}")
+    try:
+        await backfill_notification_dates(list(notifications.NOTIFICATION_TYPES))  # Dates and expiry of legacy notifications
+    except Exception as e:
+        logger.warning(f"⚠️ Notification dates backfill failed, run python notification_retention.py: {str(e)}")
     await init_admin_user()  # Initialize admin user
+    try:
+        await media.backfill_media_blobs()  # Reference counts of content stored before they existed
+    except Exception as e:
+        logger.warning(f"⚠️ Media reference counts backfill failed: {str(e)}")
+    try:
+        await image_processor.resume_pending(media.UPLOAD_DIR, media.THUMBNAIL_DIR)  # Thumbnails interrupted by a restart
+    except Exception as e:
+        logger.warning(f"⚠️ Pending thumbnails not resumed: {str(e)}")
+    await start_cache()  # Cache backend and invalidation bus
     logger.info("🚀 Anomalya Corp API started successfully!")
     yield
     # Shutdown
+    await stop_cache()
+    password_hasher.shutdown()
+    image_processor.shutdown()
     await close_mongo_connection()
     logger.info("👋 Anomalya Corp API shutdown complete!")
 
@@ -93,6 +121,7 @@ app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(analytics.router)
 app.include_router(media.router)
+app.include_router(media.public_router)
 app.include_router(notifications.router)
 app.include_router(client.router)
 
@@ -111,7 +140,8 @@ async def health_check():
 uploads_dir = Path("uploads")
 uploads_dir.mkdir(exist_ok=True)
 
-app.mount("/api/media/files", StaticFiles(directory=uploads_dir), name="media_files")
+# Images: ?w=&h=&fit=&fmt= serves resized variants (see image_resizing.py)
+app.mount("/api/media/files", MediaFiles(directory=uploads_dir), name="media_files")
 app.mount("/api/media/thumbnails", StaticFiles(directory=uploads_dir / "thumbnails"), name="media_thumbnails")
 
 # CORS middleware
@@ -0,0 +1,246 @@
+"""
+Tests pour les listes d'administration
+"""
+import pytest
+import uuid
+from pymongo import monitoring
+
+class CommandCounter(monitoring.CommandListener):
+    """Compte les commandes envoyées à MongoDB"""
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+# Enregistré avant la création du client Motor par le lifespan de l'app
+command_counter = CommandCounter()
+monitoring.register(command_counter)
+
+def count_round_trips(client, url, headers):
+    """Nombre de commandes MongoDB émises pendant une requête"""
+    command_counter.commands.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return len(command_counter.commands)
+
+def register_clients(client, count):
+    """Créer des clients de test"""
+    for _ in range(count):
+        suffix = uuid.uuid4().hex[:8]
+        client.post("/api/auth/register", json={
+            "username": f"client_{suffix}",
+            "password": "password123",
+            "email": f"client_{suffix}@test.com",
+            "full_name": f"Client {suffix}"
+        })
+
+@pytest.mark.parametrize("endpoint", [
+    "/api/admin/clients",
+    "/api/admin/users?role=client"
+])
+def test_listing_round_trips_independent_of_page_size(client, admin_token, auth_headers, endpoint):
+    """Le nombre d'allers-retours MongoDB ne dépend pas de la taille de la page"""
+    if admin_token:
+        headers = auth_headers(admin_token)
+        register_clients(client, 12)
+
+        small_page = count_round_trips(client, f"{endpoint}{'&' if '?' in endpoint else '?'}limit=2", headers)
+        large_page = count_round_trips(client, f"{endpoint}{'&' if '?' in endpoint else '?'}limit=12", headers)
+
+        assert small_page == large_page
+
+def test_concurrent_point_awards_are_not_lost(client, admin_token, auth_headers):
+    """Des attributions de points simultanées s'additionnent toutes"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        suffix = uuid.uuid4().hex[:8]
+        response = client.post("/api/auth/register", json={
+            "username": f"points_{suffix}",
+            "password": "password123",
+            "email": f"points_{suffix}@test.com",
+            "full_name": f"Points {suffix}"
+        })
+        assert response.status_code == 200
+        user_id = response.json()["data"]["user_id"]
+
+        def award(_):
+            return client.post(
+                f"/api/admin/clients/{user_id}/points",
+                params={"points": 10, "description": "Test concurrence"},
+                headers=headers
+            ).status_code
+
+        with ThreadPoolExecutor(16) as pool:
+            statuses = list(pool.map(award, range(100)))
+        assert statuses == [200] * 100
+
+        response = client.post("/api/admin/clients/points/bulk", json={
+            "awards": [{"user_id": user_id, "points": 500}, {"user_id": "inconnu", "points": 5}],
+            "description": "Test bulk"
+        }, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"] == {"awarded": 1, "missing": ["inconnu"]}
+
+        users = client.get(f"/api/admin/users?search=points_{suffix}", headers=headers).json()["data"]
+        user = next(u for u in users if u["id"] == user_id)
+        assert user["total_points"] == 1500
+        assert user["loyalty_tier"] == "silver"
+
+def test_client_stats_single_round_trip(client, admin_token, auth_headers):
+    """Les statistiques clients sont calculées en une seule agrégation"""
+    if admin_token:
+        headers = auth_headers(admin_token)
+        register_clients(client, 3)
+
+        # Premier appel : met aussi l'administrateur en cache
+        stats = client.get("/api/admin/stats/clients", headers=headers).json()
+        assert count_round_trips(client, "/api/admin/stats/clients", headers) == 1
+
+        assert stats["total_clients"] >= 3
+        assert stats["total_points_distributed"] >= 0
+
+def test_concurrent_ticket_replies_are_all_kept(client, admin_token, client_token, auth_headers):
+    """Des réponses simultanées à un ticket sont toutes conservées"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if admin_token and client_token:
+        response = client.post("/api/client/tickets", json={
+            "title": "Ticket concurrent",
+            "description": "Test",
+            "category": "technical"
+        }, headers=auth_headers(client_token))
+        assert response.status_code == 200
+        ticket_id = response.json()["data"]["id"]
+
+        def reply(index):
+            return client.post(
+                f"/api/admin/tickets/{ticket_id}/messages",
+                json={"message": f"Réponse {index}"},
+                headers=auth_headers(admin_token)
+            ).status_code
+
+        with ThreadPoolExecutor(8) as pool:
+            statuses = list(pool.map(reply, range(20)))
+        assert statuses == [200] * 20
+
+        tickets = client.get("/api/admin/tickets?limit=100", headers=auth_headers(admin_token)).json()
+        ticket = next(t for t in tickets if t["id"] == ticket_id)
+        assert ticket["message_count"] == 20
+
+def test_ticket_thread_pagination(client, admin_token, client_token, auth_headers):
+    """Les listes renvoient des résumés et le fil se lit page par page"""
+    if admin_token and client_token:
+        response = client.post("/api/client/tickets", json={
+            "title": "Fil paginé",
+            "description": "Test",
+            "category": "general"
+        }, headers=auth_headers(client_token))
+        ticket_id = response.json()["data"]["id"]
+
+        for index in range(5):
+            client.post(
+                f"/api/admin/tickets/{ticket_id}/messages",
+                json={"message": f"Réponse {index}"},
+                headers=auth_headers(admin_token)
+            )
+
+        tickets = client.get("/api/client/tickets", headers=auth_headers(client_token)).json()
+        summary = next(t for t in tickets if t["id"] == ticket_id)
+        assert "messages" not in summary
+        assert summary["message_count"] == 5
+        assert summary["last_message"]["message"] == "Réponse 4"
+        assert summary["has_unread"] is True
+
+        collected, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = client.get(
+                f"/api/client/tickets/{ticket_id}/messages",
+                params=params, headers=auth_headers(client_token)
+            ).json()
+            assert page["total"] == 5
+            collected = page["messages"] + collected
+            cursor = page["nextCursor"]
+            if not cursor:
+                break
+
+        assert [m["message"] for m in collected] == [f"Réponse {index}" for index in range(5)]
+
+        tickets = client.get("/api/client/tickets", headers=auth_headers(client_token)).json()
+        assert next(t for t in tickets if t["id"] == ticket_id)["has_unread"] is False
+
+def test_old_notifications_purged_in_bulk(client, admin_token, auth_headers):
+    """Les anciennes notifications sont toutes supprimées, au-delà de 100, selon la rétention de leur type"""
+    from datetime import datetime, timedelta
+    from database import get_collection
+
+    async def backdate(ids, days):
+        collection = await get_collection("notifications")
+        await collection.update_many(
+            {"id": {"$in": ids}},
+            {"$set": {"createdAt": datetime.utcnow() - timedelta(days=days)}}
+        )
+
+    def create(type, count):
+        return [client.post("/api/admin/notifications/", json={
+            "type": type,
+            "title": "Test rétention",
+            "message": "Ancienne notification"
+        }, headers=auth_headers(admin_token)).json()["data"]["id"] for _ in range(count)]
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        old = create("NEW_CONTACT", 120)
+        security = create("SECURITY_ALERT", 3)
+        recent = create("NEW_CONTACT", 2)
+        client.portal.call(backdate, old + security, 40)
+
+        response = client.delete("/api/admin/notifications/", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["message"].startswith("120 ")
+
+        remaining = client.get("/api/admin/notifications/?limit=100", headers=headers).json()["data"]
+        remaining_ids = {n["id"] for n in remaining["notifications"]}
+        assert set(security + recent) <= remaining_ids
+        assert not remaining_ids & set(old)
+
+def test_legacy_notification_dates_backfilled(client, admin_token, monkeypatch):
+    """Les createdAt texte (heure locale du serveur) deviennent des dates UTC avec expiresAt"""
+    from datetime import datetime, timedelta
+    from database import get_collection
+    from notification_retention import backfill_notification_dates, retention_days
+
+    notification_id = str(uuid.uuid4())
+
+    async def insert_legacy():
+        collection = await get_collection("notifications")
+        await collection.insert_one({
+            "id": notification_id,
+            "type": "NEW_CONTACT",
+            "title": "Ancienne notification",
+            "createdAt": "2024-01-15T10:30:00.123456"
+        })
+
+    async def find_and_delete():
+        collection = await get_collection("notifications")
+        notification = await collection.find_one({"id": notification_id})
+        await collection.delete_one({"id": notification_id})
+        return notification
+
+    if admin_token:
+        monkeypatch.setenv("NOTIFICATION_LEGACY_TIMEZONE", "+02:00")
+        client.portal.call(insert_legacy)
+        client.portal.call(backfill_notification_dates, ["NEW_CONTACT"])
+        notification = client.portal.call(find_and_delete)
+
+        assert notification["createdAt"] == datetime(2024, 1, 15, 8, 30)
+        assert notification["expiresAt"] == datetime(2024, 1, 15, 8, 30) + timedelta(days=retention_days("NEW_CONTACT"))
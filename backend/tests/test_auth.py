@@ -138,4 +138,57 @@ def test_token_expiration_handling(client):
 def test_refresh_token_functionality(client):
     """Test de la fonctionnalité de rafraîchissement des tokens"""
     # À implémenter si la fonctionnalité de refresh token existe
-    pass
\ No newline at end of file
+    pass
+
+
+def test_password_hasher_pool():
+    """Le hachage bcrypt passe par le pool borné et alimente les métriques"""
+    import asyncio
+    from passwords import PasswordHasher
+    
+    hasher = PasswordHasher(max_workers=2)
+    
+    async def scenario():
+        hashed = await hasher.hash("password123")
+        results = await asyncio.gather(
+            *[hasher.verify(password, hashed) for password in ["password123", "wrong", "password123", "x"]]
+        )
+        return results, hasher.stats()
+    
+    try:
+        results, stats = asyncio.run(scenario())
+    finally:
+        hasher.shutdown()
+    
+    assert results == [True, False, True, False]
+    assert stats["completed"] == 5
+    assert stats["queueDepth"] == 0
+    assert stats["peakQueueDepth"] >= 2
+
+def test_principal_cache_invalidation():
+    """Un utilisateur modifié est retiré du cache des principaux"""
+    import asyncio
+    from cache import configure_cache, MemoryBackend, LocalInvalidationBus, MISSING
+    from auth import principal_cache, invalidate_principal
+    
+    class RecordingBackend(MemoryBackend):
+        def __init__(self):
+            super().__init__()
+            self.prefixes = []
+
+        async def delete_prefix(self, prefix):
+            self.prefixes.append(prefix)
+            return await super().delete_prefix(prefix)
+
+    # Le handler d'éviction survit au remplacement du bus
+    backend = RecordingBackend()
+    configure_cache(backend, LocalInvalidationBus())
+    principal_cache.set("user-1", "principal", ttl=60)
+    principal_cache.set("user-2", "principal", ttl=60)
+    
+    asyncio.run(invalidate_principal("user-1"))
+    
+    assert principal_cache.get("user-1") is MISSING
+    assert principal_cache.get("user-2") == "principal"
+    # Les principaux ne sont pas dans le backend partagé : aucun parcours par préfixe
+    assert backend.prefixes == []
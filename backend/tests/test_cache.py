@@ -0,0 +1,92 @@
+"""
+Tests pour le cache de réponses et le bus d'invalidation
+"""
+import asyncio
+import time
+import pytest
+
+from cache import (
+    MemoryCache, MemoryBackend, LocalInvalidationBus, RedisInvalidationBus,
+    MISSING, configure_cache, cached, invalidate
+)
+
+def test_memory_cache_lru_eviction():
+    """Les entrées les moins récemment utilisées sont évincées"""
+    store = MemoryCache(max_entries=2)
+    store.set("a:1", 1, ttl=60)
+    store.set("a:2", 2, ttl=60)
+    store.get("a:1")
+    store.set("a:3", 3, ttl=60)
+
+    assert store.get("a:2") is MISSING
+    assert store.get("a:1") == 1
+    assert store.get("a:3") == 3
+    assert store.stats()["evictions"] == 1
+
+def test_memory_cache_expiry_and_counters():
+    """Les entrées expirées comptent comme des miss"""
+    store = MemoryCache()
+    store.set("faq:list", ["q"], ttl=0.01)
+    assert store.get("faq:list") == ["q"]
+    time.sleep(0.02)
+    assert store.get("faq:list") is MISSING
+
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_cached_and_invalidate():
+    """Le loader n'est appelé qu'au premier accès puis après invalidation"""
+    configure_cache(MemoryBackend(), LocalInvalidationBus())
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"services": len(calls)}
+
+    async def scenario():
+        first = await cached("services:list", loader)
+        second = await cached("services:list", loader)
+        await invalidate("services")
+        third = await cached("services:list", loader)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert first == second == {"services": 1}
+    assert third == {"services": 2}
+
+def test_redis_bus_evicts_other_workers():
+    """Une invalidation publiée par un worker vide le cache des autres"""
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        worker_a = MemoryBackend()
+        worker_b = MemoryBackend()
+        bus_a = RedisInvalidationBus(fakeredis.aioredis.FakeRedis(server=server))
+        bus_b = RedisInvalidationBus(fakeredis.aioredis.FakeRedis(server=server))
+
+        async def evict_b(namespaces):
+            for namespace in namespaces:
+                await worker_b.delete_prefix(f"{namespace}:")
+
+        bus_b.subscribe(evict_b)
+        await bus_a.start()
+        await bus_b.start()
+
+        await worker_a.set("news:list:page1", {"articles": []}, 60)
+        await worker_b.set("news:list:page1", {"articles": []}, 60)
+        await asyncio.sleep(0.05)
+
+        await bus_a.publish(["news"])
+        for _ in range(50):
+            if await worker_b.get("news:list:page1") is MISSING:
+                break
+            await asyncio.sleep(0.01)
+
+        evicted = await worker_b.get("news:list:page1") is MISSING
+        await bus_a.stop()
+        await bus_b.stop()
+        return evicted
+
+    assert asyncio.run(scenario())
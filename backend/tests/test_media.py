@@ -0,0 +1,251 @@
+"""
+Tests pour la médiathèque
+"""
+import hashlib
+import io
+import time
+from PIL import Image
+
+from routers.media import UPLOAD_DIR, MAX_FILE_SIZE
+
+def png_bytes(size=(64, 48), color="red"):
+    """Image PNG de test"""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+def wait_until_processed(client, headers, uploaded):
+    """Attendre la fin du traitement en arrière-plan d'une image"""
+    for _ in range(100):
+        files = client.get(
+            f"/api/admin/media/files?search={uploaded['name']}", headers=headers
+        ).json()["data"]["files"]
+        file_data = next(f for f in files if f["id"] == uploaded["id"])
+        if file_data["thumbnailStatus"] != "pending":
+            return file_data
+        time.sleep(0.1)
+    return file_data
+
+def test_upload_streamed_with_hash_and_size_limit(client, admin_token, auth_headers):
+    """Les fichiers sont copiés par blocs : hash calculé, fichiers trop gros rejetés sans résidu"""
+    if admin_token:
+        content = png_bytes()
+        response = client.post(
+            "/api/admin/media/upload",
+            files=[
+                ("files", ("photo.png", content, "image/png")),
+                ("files", ("enorme.pdf", b"0" * (MAX_FILE_SIZE + 1), "application/pdf")),
+            ],
+            headers=auth_headers(admin_token)
+        )
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        uploaded = data["uploaded"][0]
+        assert uploaded["size"] == len(content)
+        assert uploaded["sha256"] == hashlib.sha256(content).hexdigest()
+        assert (UPLOAD_DIR / uploaded["safeName"]).read_bytes() == content
+
+        assert len(data["errors"]) == 1 and "enorme.pdf" in data["errors"][0]
+        assert not list((UPLOAD_DIR / ".incoming").glob("*.part"))
+
+def test_thumbnail_generated_in_background(client, admin_token, auth_headers):
+    """L'upload répond avant la miniature, le document passe ensuite à ready avec les dimensions"""
+    if admin_token:
+        headers = auth_headers(admin_token)
+        response = client.post(
+            "/api/admin/media/upload",
+            files=[("files", ("large.png", png_bytes((1600, 900)), "image/png"))],
+            headers=headers
+        )
+        uploaded = response.json()["data"]["uploaded"][0]
+        assert uploaded["thumbnailStatus"] == "pending"
+
+        file_data = wait_until_processed(client, headers, uploaded)
+        assert file_data["thumbnailStatus"] == "ready"
+        assert file_data["dimensions"] == {"width": 1600, "height": 900}
+        assert client.get(file_data["thumbnail"]).status_code == 200
+
+def test_image_variant_negotiated_from_accept(client, admin_token, auth_headers):
+    """Les dérivés sont enregistrés et /api/media/images sert le format accepté à la bonne largeur"""
+    if admin_token:
+        headers = auth_headers(admin_token)
+        response = client.post(
+            "/api/admin/media/upload",
+            files=[("files", ("hero.png", png_bytes((2000, 1000)), "image/png"))],
+            headers=headers
+        )
+        uploaded = response.json()["data"]["uploaded"][0]
+        file_data = wait_until_processed(client, headers, uploaded)
+        assert {(d["format"], d["width"]) for d in file_data["derivatives"]} >= {
+            ("webp", 480), ("webp", 960), ("jpeg", 480), ("jpeg", 1600)
+        }
+
+        webp = client.get(f"{uploaded['imageUrl']}?w=500", headers={"Accept": "image/webp,*/*"})
+        assert webp.status_code == 200
+        assert webp.headers["content-type"] == "image/webp"
+        assert webp.headers["vary"] == "Accept"
+        assert Image.open(io.BytesIO(webp.content)).width == 960
+
+        jpeg = client.get(uploaded["imageUrl"], headers={"Accept": "image/jpeg"})
+        assert jpeg.headers["content-type"] == "image/jpeg"
+        assert Image.open(io.BytesIO(jpeg.content)).width == 1600
+
+        revalidated = client.get(uploaded["imageUrl"], headers={
+            "Accept": "image/jpeg", "If-None-Match": jpeg.headers["etag"]
+        })
+        assert revalidated.status_code == 304
+
+def test_on_demand_resize_generated_once(client, admin_token, auth_headers):
+    """Une variante demandée simultanément n'est générée qu'une fois puis servie depuis le cache disque"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        response = client.post(
+            "/api/admin/media/upload",
+            files=[("files", ("resize.png", png_bytes((1200, 800), "blue"), "image/png"))],
+            headers=headers
+        )
+        uploaded = response.json()["data"]["uploaded"][0]
+
+        def misses():
+            return client.get("/api/admin/system/metrics", headers=headers).json()["resizedImages"]["misses"]
+
+        before = misses()
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(pool.map(
+                lambda _: client.get(f"{uploaded['url']}?w=300&fmt=jpeg"), range(8)
+            ))
+        assert {r.status_code for r in responses} == {200}
+        assert len({r.content for r in responses}) == 1
+        assert Image.open(io.BytesIO(responses[0].content)).size == (300, 200)
+        assert misses() == before + 1
+
+        cover = client.get(f"/api/media/files/{uploaded['id']}?w=100&h=100&fit=cover&fmt=webp")
+        assert cover.headers["content-type"] == "image/webp"
+        assert Image.open(io.BytesIO(cover.content)).size == (100, 100)
+
+        assert client.get(f"{uploaded['url']}?w=0").status_code == 400
+        assert client.get(uploaded["url"]).content == png_bytes((1200, 800), "blue")
+
+def test_duplicate_uploads_share_stored_content(client, admin_token, auth_headers):
+    """Un contenu identique est stocké une fois et supprimé avec sa dernière référence"""
+    import base64
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        content = png_bytes((320, 240), "green")
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        first = client.post(
+            "/api/admin/media/upload",
+            files=[("files", ("logo.png", content, "image/png"))],
+            headers=headers
+        ).json()["data"]["uploaded"][0]
+        second = client.post(
+            "/api/admin/media/upload-base64",
+            data={"image_data": f"data:image/png;base64,{base64.b64encode(content).decode()}", "filename": "logo-copie"},
+            headers=headers
+        ).json()["data"]
+
+        assert first["id"] != second["id"]
+        assert first["safeName"] == second["safeName"] == f"{sha256}.png"
+        blob = UPLOAD_DIR / first["safeName"]
+
+        assert client.delete(f"/api/admin/media/files/{first['id']}", headers=headers).status_code == 200
+        assert blob.exists()
+        assert client.get(second["url"]).content == content
+
+        processed = wait_until_processed(client, headers, {"id": second["id"], "name": "logo-copie"})
+        assert client.delete(f"/api/admin/media/files/{second['id']}", headers=headers).status_code == 200
+        assert not blob.exists()
+        assert client.get(processed["thumbnail"]).status_code == 404
+
+def test_delete_interleaved_with_duplicate_upload(client, admin_token, auth_headers):
+    """Un doublon reçu pendant la suppression de la dernière référence garde son fichier"""
+    import asyncio
+    from database import get_collection
+    from media_storage import stage_upload, iter_bytes
+    from routers.media import (
+        delete_media_file, store_content, release_content, remove_content_files, finish_removal, BLOB_COLLECTION
+    )
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        content = png_bytes((200, 100), "purple")
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        for delete_first in (True, False):
+            uploaded = client.post(
+                "/api/admin/media/upload",
+                files=[("files", ("violet.png", content, "image/png"))],
+                headers=headers
+            ).json()["data"]["uploaded"][0]
+
+            async def interleave():
+                staged = await stage_upload(iter_bytes(content), UPLOAD_DIR, MAX_FILE_SIZE)
+                delete = delete_media_file(uploaded["id"], current_user=None)
+                upload = store_content(staged, ".png", "image")
+                if delete_first:
+                    _, stored = await asyncio.gather(delete, upload)
+                else:
+                    stored, _ = await asyncio.gather(upload, delete)
+                blobs = await get_collection(BLOB_COLLECTION)
+                return stored, await blobs.find_one({"sha256": sha256}, {"_id": 0})
+
+            async def release(stored):
+                if await release_content(sha256):
+                    remove_content_files(stored)
+                    await finish_removal(sha256)
+
+            stored, blob = client.portal.call(interleave)
+            assert (UPLOAD_DIR / stored["safeName"]).read_bytes() == content
+            assert blob["refs"] == 1 and "removing" not in blob
+
+            client.portal.call(release, stored)
+            assert not (UPLOAD_DIR / stored["safeName"]).exists()
+
+def test_duplicate_upload_retries_failed_processing(client, admin_token, auth_headers):
+    """Un doublon relance le traitement d'un contenu en échec ou resté en attente sans tâche"""
+    from database import get_collection
+
+    async def set_status(sha256, status):
+        collection = await get_collection("media_files")
+        await collection.update_many({"sha256": sha256}, {"$set": {"thumbnailStatus": status}})
+
+    if admin_token:
+        headers = auth_headers(admin_token)
+        content = png_bytes((120, 80), "orange")
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        def upload():
+            return client.post(
+                "/api/admin/media/upload",
+                files=[("files", ("orange.png", content, "image/png"))],
+                headers=headers
+            ).json()["data"]["uploaded"][0]
+
+        first = wait_until_processed(client, headers, upload())
+        assert first["thumbnailStatus"] == "ready"
+
+        for stuck_status in ("failed", "pending"):
+            client.portal.call(set_status, sha256, stuck_status)
+            duplicate = upload()
+            assert duplicate["thumbnailStatus"] == "pending"
+            assert wait_until_processed(client, headers, duplicate)["thumbnailStatus"] == "ready"
+            assert wait_until_processed(client, headers, first)["thumbnailStatus"] == "ready"
+
+def test_accept_quality_values_respected():
+    """Les formats refusés (q=0) ne sont jamais servis, les autres sont classés par q"""
+    from image_processing import choose_variant
+    from image_resizing import negotiated_format
+
+    derivatives = [{"format": name, "width": 480} for name in ("avif", "webp", "jpeg")]
+
+    assert choose_variant(derivatives, "image/webp;q=0, image/jpeg")["format"] == "jpeg"
+    assert choose_variant(derivatives, "image/avif,image/webp,*/*;q=0.8")["format"] == "avif"
+    assert choose_variant(derivatives, "image/avif;q=0.5, image/webp;q=0.9, image/jpeg;q=0.7")["format"] == "webp"
+    assert choose_variant(derivatives, "image/png, image/jpeg;q=0") is None
+    assert negotiated_format("image/webp;q=0, image/*") == "jpeg"
+    assert negotiated_format("image/webp") == "webp"
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Support ticket threads.
+
+Messages are appended with `$push`: adding a reply writes one message, not
+the whole thread, and concurrent replies can't overwrite each other. Each
+ticket also keeps `message_count` and `last_message` up to date so lists
+return summaries without the thread; threads are read page by page with
+`get_messages_page`. Run this module to compute the counters for tickets
+created before they existed:
+
+    python tickets.py
+"""
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add the backend directory to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from database import get_collection, encode_cursor, decode_cursor, InvalidCursorError
+
+# Ticket lists never load the thread
+SUMMARY_PROJECTION = {"_id": 0, "messages": 0}
+MESSAGES_PAGE_SIZE = 50
+
+# Last time each side opened the thread
+READ_FIELDS = {True: "admin_read_at", False: "client_read_at"}
+
+def new_message(user_id: str, user_name: str, message: str, is_admin: bool) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "user_name": user_name,
+        "message": message,
+        "timestamp": datetime.utcnow(),
+        "is_admin": is_admin
+    }
+
+async def append_message(ticket_id: str, message: dict, user_id: str = None) -> bool:
+    """Append a message to a ticket (restricted to the owner when user_id is given)
+
+    Returns False when no matching ticket exists.
+    """
+    collection = await get_collection("support_tickets")
+    query = {"id": ticket_id}
+    if user_id:
+        query["user_id"] = user_id
+
+    result = await collection.update_one(query, {
+        "$push": {"messages": message},
+        "$inc": {"message_count": 1},
+        "$set": {"last_message": message, "updated_at": message["timestamp"]}
+    })
+    return result.matched_count > 0
+
+def ticket_summary(ticket: dict, viewer_is_admin: bool) -> dict:
+    """Add `has_unread`: the other side wrote since the viewer last opened the thread"""
+    last_message = ticket.get("last_message")
+    read_at = ticket.get(READ_FIELDS[viewer_is_admin])
+    ticket["has_unread"] = bool(
+        last_message
+        and last_message.get("is_admin") != viewer_is_admin
+        and (read_at is None or last_message["timestamp"] > read_at)
+    )
+    return ticket
+
+async def get_messages_page(ticket_id: str, viewer_is_admin: bool, cursor: str = None,
+                            limit: int = MESSAGES_PAGE_SIZE, user_id: str = None):
+    """One page of a ticket thread, starting from the most recent messages
+
+    Messages are returned in chronological order. The cursor holds the
+    position of the oldest message already returned (stable, since threads
+    are append-only). Returns (messages, next_cursor, total) or None if the
+    ticket doesn't exist. Opening the first page marks the thread as read.
+    Raises InvalidCursorError on an invalid cursor.
+    """
+    collection = await get_collection("support_tickets")
+    query = {"id": ticket_id}
+    if user_id:
+        query["user_id"] = user_id
+
+    if cursor:
+        position = decode_cursor(cursor)["v"]
+        if not isinstance(position, int) or position <= 0:
+            raise InvalidCursorError("Invalid pagination cursor")
+        start = max(0, position - limit)
+        window = [start, position - start]
+    else:
+        window = -limit
+
+    ticket = await collection.find_one(
+        query, {"_id": 0, "message_count": 1, "messages": {"$slice": window}}
+    )
+    if not ticket:
+        return None
+
+    messages = ticket.get("messages", [])
+    total = ticket.get("message_count", len(messages))
+    if cursor:
+        first_position = start
+    else:
+        first_position = total - len(messages)
+        await collection.update_one(
+            {"id": ticket_id}, {"$set": {READ_FIELDS[viewer_is_admin]: datetime.utcnow()}}
+        )
+
+    next_cursor = None
+    if first_position > 0 and messages:
+        next_cursor = encode_cursor({"v": first_position, "id": messages[0].get("id")})
+
+    return messages, next_cursor, total
+
+async def backfill_ticket_summaries():
+    """Compute message_count and last_message from the stored threads"""
+    collection = await get_collection("support_tickets")
+    result = await collection.update_many(
+        {"message_count": {"$exists": False}},
+        [{"$set": {
+            "message_count": {"$size": {"$ifNull": ["$messages", []]}},
+            "last_message": {"$last": {"$ifNull": ["$messages", []]}}
+        }}]
+    )
+    return result.modified_count
+
+async def main():
+    from database import connect_to_mongo, close_mongo_connection
+
+    try:
+        print("🔗 Connecting to MongoDB...")
+        await connect_to_mongo()
+        print("🎫 Computing ticket summaries...")
+        updated = await backfill_ticket_summaries()
+        print(f"✅ {updated} tickets updated")
+    except Exception as e:
+        print(f"❌ Error computing ticket summaries: {str(e)}")
+    finally:
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,7 @@ import { Button } from './ui/button';
 import { Card, CardContent } from './ui/card';
 import { Badge } from './ui/badge';
 import { newsAPI } from '../services/api';
+import { imageSrc } from '../lib/utils';
 import { Calendar, Clock, ArrowRight, Pin, Loader2 } from 'lucide-react';
 
 const NewsSection = () => {
@@ -86,7 +87,7 @@ const NewsSection = () => {
               {/* Image */}
               <div className="relative overflow-hidden">
                 <img 
-                  src={article.image} 
+                  src={imageSrc(article.image, 480)} 
                   alt={article.title}
                   className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
                 />
@@ -4,3 +4,11 @@ import { twMerge } from "tailwind-merge"
 export function cn(...inputs) {
   return twMerge(clsx(inputs));
 }
+
+// Images de la médiathèque : demander la variante adaptée à la largeur affichée
+export function imageSrc(url, width) {
+  if (!url || !width || !url.includes("/api/media/images/")) {
+    return url;
+  }
+  return `${url}${url.includes("?") ? "&" : "?"}w=${width}`;
+}
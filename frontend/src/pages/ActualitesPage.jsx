@@ -8,6 +8,7 @@ import { Badge } from '../components/ui/badge';
 import { Input } from '../components/ui/input';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '../components/ui/select';
 import { newsAPI } from '../services/api';
+import { imageSrc } from '../lib/utils';
 import { Calendar, Clock, ArrowRight, Pin, Search, Loader2 } from 'lucide-react';
 
 const ActualitesPage = () => {
@@ -181,7 +182,7 @@ const ActualitesPage = () => {
                   <Card key={article.id} className="bg-slate-900/50 backdrop-blur-sm border-slate-700 hover:border-blue-500/50 transition-all duration-300 group overflow-hidden">
                     <div className="relative overflow-hidden">
                       <img 
-                        src={article.image} 
+                        src={imageSrc(article.image, 480)} 
                         alt={article.title}
                         className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
                       />
@@ -255,7 +256,7 @@ const ActualitesPage = () => {
                   <Card key={article.id} className="bg-slate-900/50 backdrop-blur-sm border-slate-700 hover:border-blue-500/50 transition-all duration-300 group overflow-hidden">
                     <div className="relative overflow-hidden">
                       <img 
-                        src={article.image} 
+                        src={imageSrc(article.image, 480)} 
                         alt={article.title}
                         className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
                       />
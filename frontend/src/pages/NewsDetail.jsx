@@ -5,6 +5,7 @@ import Footer from '../components/Footer';
 import { Button } from '../components/ui/button';
 import { Badge } from '../components/ui/badge';
 import { newsAPI } from '../services/api';
+import { imageSrc } from '../lib/utils';
 import { Calendar, Clock, User, ArrowLeft, Share2, Bookmark, Loader2 } from 'lucide-react';
 import { useToast } from '../hooks/use-toast';
 
@@ -218,7 +219,7 @@ const NewsDetail = () => {
                   <Link key={relatedArticle.id} to={`/news/${relatedArticle.id}`} className="group">
                     <div className="bg-slate-900/50 backdrop-blur-sm border border-slate-700 rounded-xl p-6 hover:border-blue-500/50 transition-all duration-300">
                       <img 
-                        src={relatedArticle.image} 
+                        src={imageSrc(relatedArticle.image, 480)} 
                         alt={relatedArticle.title}
                         className="w-full h-32 object-cover rounded-lg mb-4 group-hover:scale-105 transition-transform duration-300"
                       />
@@ -462,7 +462,7 @@ const AdminArticles = () => {
                         <MediaManager
                           onSelectMedia={(media) => {
                             if (media.type === 'image') {
-                              setFormData(prev => ({ ...prev, image: media.url }));
+                              setFormData(prev => ({ ...prev, image: media.imageUrl || media.url }));
                             }
                           }}
                           allowedTypes={['image']}
@@ -44,6 +44,9 @@ const AdminTickets = () => {
   const [dialogOpen, setDialogOpen] = useState(false);
   const [replyMessage, setReplyMessage] = useState('');
   const [sendingReply, setSendingReply] = useState(false);
+  const [threadMessages, setThreadMessages] = useState([]);
+  const [threadCursor, setThreadCursor] = useState(null);
+  const [loadingThread, setLoadingThread] = useState(false);
 
   useEffect(() => {
     const fetchTickets = async () => {
@@ -152,6 +155,21 @@ const AdminTickets = () => {
     }
   };
 
+  // Threads are paginated: the most recent messages first, older ones on demand
+  const loadThread = async (ticketId, cursor = null) => {
+    setLoadingThread(true);
+    try {
+      const response = await adminAPI.getTicketMessages(ticketId, { cursor });
+      const page = response.data.messages || [];
+      setThreadMessages(previous => (cursor ? [...page, ...previous] : page));
+      setThreadCursor(response.data.nextCursor || null);
+    } catch (error) {
+      console.error('Error fetching messages:', error);
+    } finally {
+      setLoadingThread(false);
+    }
+  };
+
   const handleSendReply = async () => {
     if (!selectedTicket || !replyMessage.trim()) {
       toast({
@@ -393,10 +411,10 @@ const AdminTickets = () => {
                             {new Date(ticket.created_at).toLocaleDateString('fr-FR')}
                           </span>
                         </div>
-                        {ticket.messages && ticket.messages.length > 0 && (
+                        {ticket.message_count > 0 && (
                           <div className="flex items-center text-gray-400">
                             <MessageCircle className="h-4 w-4 mr-1" />
-                            <span className="text-sm">{ticket.messages.length} message{ticket.messages.length > 1 ? 's' : ''}</span>
+                            <span className="text-sm">{ticket.message_count} message{ticket.message_count > 1 ? 's' : ''}{ticket.has_unread ? ' · nouveau' : ''}</span>
                           </div>
                         )}
                         {ticket.assigned_to && (
@@ -417,6 +435,8 @@ const AdminTickets = () => {
                         setDialogOpen(open);
                         if (open) {
                           setSelectedTicket(ticket);
+                          setThreadMessages([]);
+                          loadThread(ticket.id);
                         } else {
                           setSelectedTicket(null);
                           setReplyMessage('');
@@ -460,12 +480,26 @@ const AdminTickets = () => {
                             </div>
                             
                             {/* Messages History */}
-                            {ticket.messages && ticket.messages.length > 0 && (
+                            {threadMessages.length > 0 && (
                               <div className="space-y-3">
                                 <h4 className="text-white font-medium">Historique des messages</h4>
                                 <div className="max-h-64 overflow-y-auto space-y-3">
-                                  {ticket.messages.map((message, index) => (
-                                    <div key={index} className={`p-3 rounded-lg ${
+                                  {threadCursor && (
+                                    <div className="text-center">
+                                      <Button
+                                        size="sm"
+                                        variant="outline"
+                                        onClick={() => loadThread(ticket.id, threadCursor)}
+                                        disabled={loadingThread}
+                                        className="border-slate-600 text-gray-300"
+                                      >
+                                        {loadingThread ? <Loader2 className="animate-spin h-4 w-4 mr-1" /> : null}
+                                        Messages précédents
+                                      </Button>
+                                    </div>
+                                  )}
+                                  {threadMessages.map((message, index) => (
+                                    <div key={message.id || index} className={`p-3 rounded-lg ${
                                       message.is_admin ? 'bg-blue-500/10 border border-blue-500/20' : 'bg-slate-800/50'
                                     }`}>
                                       <div className="flex items-center justify-between mb-1">
@@ -536,16 +570,16 @@ const AdminTickets = () => {
                   </div>
                   
                   {/* Last message preview */}
-                  {ticket.messages && ticket.messages.length > 0 && (
+                  {ticket.last_message && (
                     <div className="mt-4 p-3 bg-slate-800/50 border border-slate-700 rounded-lg">
                       <div className="text-sm text-gray-400 mb-1">
-                        Dernier message {ticket.messages[ticket.messages.length - 1].is_admin ? '(Support)' : '(Client)'}:
+                        Dernier message {ticket.last_message.is_admin ? '(Support)' : '(Client)'}:
                       </div>
                       <div className="text-sm text-white line-clamp-2">
-                        {ticket.messages[ticket.messages.length - 1].message}
+                        {ticket.last_message.message}
                       </div>
                       <div className="text-xs text-gray-500 mt-1">
-                        {new Date(ticket.messages[ticket.messages.length - 1].timestamp).toLocaleDateString('fr-FR', {
+                        {new Date(ticket.last_message.timestamp).toLocaleDateString('fr-FR', {
                           day: 'numeric',
                           month: 'short',
                           hour: '2-digit',
@@ -276,10 +276,10 @@ const MyTickets = () => {
                             {getCategoryIcon(ticket.category)}
                             <span className="ml-1">{getCategoryLabel(ticket.category)}</span>
                           </div>
-                          {ticket.messages && ticket.messages.length > 0 && (
+                          {ticket.message_count > 0 && (
                             <div className="flex items-center">
                               <MessageCircle className="h-3 w-3 mr-1" />
-                              {ticket.messages.length} message{ticket.messages.length > 1 ? 's' : ''}
+                              {ticket.message_count} message{ticket.message_count > 1 ? 's' : ''}{ticket.has_unread ? ' · nouveau' : ''}
                             </div>
                           )}
                         </div>
@@ -302,17 +302,17 @@ const MyTickets = () => {
                     </div>
                     
                     {/* Last message preview */}
-                    {ticket.messages && ticket.messages.length > 0 && (
+                    {ticket.last_message && (
                       <div className="mt-4 p-3 bg-slate-800/50 border border-slate-700 rounded-lg">
                         <div className="text-sm text-gray-400 mb-1">
-                          Dernier message {ticket.messages[ticket.messages.length - 1].is_admin ? '(Support)' : '(Vous)'}:
+                          Dernier message {ticket.last_message.is_admin ? '(Support)' : '(Vous)'}:
                         </div>
                         <div 
                           className="text-sm text-white line-clamp-2"
-                          dangerouslySetInnerHTML={{ __html: ticket.messages[ticket.messages.length - 1].message }}
+                          dangerouslySetInnerHTML={{ __html: ticket.last_message.message }}
                         />
                         <div className="text-xs text-gray-500 mt-1">
-                          {new Date(ticket.messages[ticket.messages.length - 1].timestamp).toLocaleDateString('fr-FR', {
+                          {new Date(ticket.last_message.timestamp).toLocaleDateString('fr-FR', {
                             day: 'numeric',
                             month: 'short',
                             hour: '2-digit',
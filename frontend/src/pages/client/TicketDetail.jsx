@@ -32,11 +32,35 @@ const TicketDetail = () => {
   const { user } = useAuth();
   const { toast } = useToast();
   const [ticket, setTicket] = useState(null);
+  const [messages, setMessages] = useState([]);
+  const [messagesCursor, setMessagesCursor] = useState(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const [loading, setLoading] = useState(true);
   const [newMessage, setNewMessage] = useState('');
   const [sendingMessage, setSendingMessage] = useState(false);
   const [error, setError] = useState(null);
 
+  // Threads are paginated: the most recent messages first, older ones on demand
+  const fetchLatestMessages = async () => {
+    const response = await clientAPI.getTicketMessages(ticketId);
+    setMessages(response.data.messages || []);
+    setMessagesCursor(response.data.nextCursor || null);
+  };
+
+  const loadOlderMessages = async () => {
+    if (!messagesCursor) return;
+    setLoadingOlder(true);
+    try {
+      const response = await clientAPI.getTicketMessages(ticketId, { cursor: messagesCursor });
+      setMessages(previous => [...(response.data.messages || []), ...previous]);
+      setMessagesCursor(response.data.nextCursor || null);
+    } catch (err) {
+      console.error('Error fetching messages:', err);
+    } finally {
+      setLoadingOlder(false);
+    }
+  };
+
   useEffect(() => {
     const fetchTicket = async () => {
       try {
@@ -49,6 +73,7 @@ const TicketDetail = () => {
         
         if (foundTicket) {
           setTicket(foundTicket);
+          await fetchLatestMessages();
         } else {
           setError('Ticket non trouvé');
         }
@@ -176,6 +201,7 @@ const TicketDetail = () => {
         if (updatedTicket) {
           setTicket(updatedTicket);
         }
+        await fetchLatestMessages();
         
         setNewMessage('');
       }
@@ -300,7 +326,7 @@ const TicketDetail = () => {
                 <div>
                   <div className="text-sm text-gray-400">Messages</div>
                   <div className="text-white font-medium">
-                    {ticket.messages ? ticket.messages.length : 0}
+                    {ticket.message_count || 0}
                   </div>
                 </div>
                 <div>
@@ -327,10 +353,23 @@ const TicketDetail = () => {
               </CardTitle>
             </CardHeader>
             <CardContent>
-              {ticket.messages && ticket.messages.length > 0 ? (
+              {messages.length > 0 ? (
                 <div className="space-y-4">
-                  {ticket.messages.map((message, index) => (
-                    <div key={index} className={`p-4 rounded-lg ${
+                  {messagesCursor && (
+                    <div className="text-center">
+                      <Button
+                        variant="outline"
+                        onClick={loadOlderMessages}
+                        disabled={loadingOlder}
+                        className="border-slate-600 text-gray-300"
+                      >
+                        {loadingOlder ? <Loader2 className="animate-spin h-4 w-4 mr-2" /> : null}
+                        Messages précédents
+                      </Button>
+                    </div>
+                  )}
+                  {messages.map((message, index) => (
+                    <div key={message.id || index} className={`p-4 rounded-lg ${
                       message.is_admin 
                         ? 'bg-blue-500/10 border border-blue-500/20 ml-4' 
                         : 'bg-slate-800/50 mr-4'
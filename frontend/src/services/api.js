@@ -188,6 +188,12 @@ export const adminAPI = {
     return api.get(`/admin/tickets?${queryParams.toString()}`);
   },
 
+  getTicketMessages: (ticketId, params = {}) => {
+    const queryParams = new URLSearchParams();
+    if (params.cursor) queryParams.append('cursor', params.cursor);
+    if (params.limit) queryParams.append('limit', params.limit);
+    return api.get(`/admin/tickets/${ticketId}/messages?${queryParams.toString()}`);
+  },
   addTicketMessage: (ticketId, message) => api.post(`/admin/tickets/${ticketId}/messages`, { message }),
   getClientStats: () => api.get(`/admin/stats/clients`),
 
@@ -240,6 +246,12 @@ export const clientAPI = {
     if (params.offset) queryParams.append('offset', params.offset);
     return api.get(`/client/tickets?${queryParams.toString()}`);
   },
+  getTicketMessages: (ticketId, params = {}) => {
+    const queryParams = new URLSearchParams();
+    if (params.cursor) queryParams.append('cursor', params.cursor);
+    if (params.limit) queryParams.append('limit', params.limit);
+    return api.get(`/client/tickets/${ticketId}/messages?${queryParams.toString()}`);
+  },
   addTicketMessage: (ticketId, message) => api.post(`/client/tickets/${ticketId}/messages`, { ticket_id: ticketId, message }),
   getPointsHistory: (params = {}) => {
     const queryParams = new URLSearchParams();